@@ -23,6 +23,8 @@ class Fish:
         - maintenance_time (float): time (in days) for maintenance per unit.
         - demand (int): current demand for fish type.
         - price (int): price per unit of fish.
+    - default_demand (dict): the demand of each fish type at the start 
+      of every quarter.
     """
 
 
@@ -85,6 +87,12 @@ class Fish:
             }
         }
 
+        # Keep the demand at the start of a quarter to reset it later
+        self.default_demand = {
+            fish_name: fish_details['demand']
+            for fish_name, fish_details in self.fish_data.items()
+        }
+
     def reset_fish_demand(self):
         """
         Reset the 'demand' attribute for each fish type to its defult value.
@@ -93,15 +101,6 @@ class Fish:
         'default_demand' This function is useful for the start of each 
         quarter to reset the demands.
         """
-        default_demand = {
-            'Clef Fins': 25,
-            'Timpani': 10,
-            'Andalusian Brim': 15,
-            'Plagal Cod': 20,
-            'Fugue Flounder': 30,
-            'Modal Bass': 50,
-        }
-
         for fish_name, fish_details in self.fish_data.items():
             # Update the 'demand' value with the default value
-            fish_details['demand'] = default_demand[fish_name]
\ No newline at end of file
+            fish_details['demand'] = self.default_demand[fish_name]
\ No newline at end of file
@@ -10,6 +10,14 @@ Description:
 from Technician import Technicians
 from Warehouse import Warehouse
 from Vendors import Vendor
+from Journal import Journal
+from Scheduler import AssignmentScheduler
+
+# The standard capacity of each resource in the warehouses
+DEFAULT_CAPACITIES = {
+    'main': {'fertilizer': 20, 'feed': 400, 'salt': 200},
+    'auxiliary': {'fertilizer': 10, 'feed': 200, 'salt': 100},
+}
 
 class Hatchery:
     """
@@ -24,9 +32,12 @@ class Hatchery:
     - fish_data (object): an instance of the 'Fish' class include fish details.
     - warehouses (dict): dictionary of 'Warehouse' objects for managing resources.
     - vendors (dict): dictionary of 'Vendor' objects for buying resources.
+    - journal (object): optional 'Journal' that records every cash movement.
+    - report (object): optional 'QuarterReport' that keeps the raw numbers
+      of the current quarter.
     """
 
-    def __init__(self, cash_balance, fish_data):
+    def __init__(self, cash_balance, fish_data, journal=None, capacities=None):
         """
         Beginning the Hatchery class with attributes.
 
@@ -34,21 +45,31 @@ class Hatchery:
             cash_balance (float): cash balance for the hatchery.
             fish_data (object): instance of the 'Fish' class that contain 
                                 fish details.
+            journal (object): instance of the 'Journal' class to record
+                              transactions, or None (default) for no journal.
+            capacities (dict): the capacity of each resource for the 'main' 
+                               and 'auxiliary' warehouses, or None (default) 
+                               for the standard capacities.
         """
         self.cash_balance = cash_balance
         self.technicians = []
         self.warehouse_cost = 1500
         self.sales = {}
         self.fish_data = fish_data
+        self.journal = journal
+        self.report = None
+
+        if capacities is None:
+            capacities = DEFAULT_CAPACITIES
 
         self.warehouses = {
             'main': Warehouse(
-                {'fertilizer': 20, 'feed': 400, 'salt': 200},
+                dict(capacities['main']),
                 {'fertilizer': 0.4, 'feed': 0.1, 'salt': 0.0},
                 {'fertilizer': 0.1, 'feed': 1.0, 'salt': 1.0}  
             ),
             'auxiliary': Warehouse(
-                {'fertilizer': 10, 'feed': 200, 'salt': 100},
+                dict(capacities['auxiliary']),
                 {'fertilizer': 0.4, 'feed': 0.1, 'salt': 0.0},
                 {'fertilizer': 0.1, 'feed': 1.0, 'salt': 1.0} 
             )
@@ -82,9 +103,32 @@ class Hatchery:
         """
         Reducing their resource quantity by Applying depreciation.
         """
+        self.apply_depreciation()
         for name, warehouse in self.warehouses.items():
-            warehouse.depreciate_resources() 
             print(f"{name.capitalize()} after depreciation: {warehouse.supplies}")
+
+    def apply_depreciation(self):
+        """
+        Applies depreciation to every warehouse without printing and
+        keeps the supplies left in the quarter report.
+
+        Returns:
+            dict: the units of each resource lost over all warehouses.
+        """
+        lost = {}
+        for name, warehouse in self.warehouses.items():
+            before = dict(warehouse.supplies)
+            warehouse.depreciate_resources()
+            for resource, units in before.items():
+                units_lost = units - warehouse.supplies[resource]
+                lost[resource] = lost.get(resource, 0) + units_lost
+                if self.journal is not None and units_lost:
+                    self.journal.record(
+                        Journal.DEPRECIATION, 0, units_lost, f"{name}:{resource}"
+                    )
+            if self.report is not None:
+                self.report.add_depreciation(name, warehouse.supplies)
+        return lost
    
     def add_technician(self, name=None, weekly_rate=500, speciality=None):
         """
@@ -170,24 +214,43 @@ class Hatchery:
         Calculates total payments for all technicians and then deduct
         cash balance and finally print it to show for users.
         """
-        total_payment = 0
         print("\n=== Technician Payment Summary ===")
+        payments, total_payment = self.pay_technicians()
+        for name, payment in payments:
+            print(f"Paid {name}, weekly rate = 500, amount: £{payment}")
+        print(f"\nTotal technician payment: £{total_payment}")
+        print(f"Remaining cash balance: £{self.cash_balance}")
+    
+    def pay_technicians(self):
+        """
+        Pays every technician for one quarter (12 weeks) without printing.
+
+        Returns:
+            tuple: a list of (technician name, payment) and the total payment.
+        """
+        payments = []
+        total_payment = 0
         for technician in self.technicians:
             # Calculate payment for 12 weeks (1 quarter)
-            payment = technician.weekly_rate * 12  
+            payment = technician.weekly_rate * 12
             total_payment += payment
-            print(f"Paid {technician.name}, weekly rate = 500, amount: £{payment}")
+            payments.append((technician.name, payment))
+            if self.journal is not None:
+                self.journal.record(Journal.PAYROLL, -payment, 12, technician.name)
+            if self.report is not None:
+                self.report.add_payment(technician.name, payment)
         self.cash_balance -= total_payment  # Deduct total payments
         self.update_cash_balance()  # Update balance
-        print(f"\nTotal technician payment: £{total_payment}")
-        print(f"Remaining cash balance: £{self.cash_balance}")
-    
+        return payments, total_payment
+
     def sell_fish(self):
         """
         Let users to sell fish while considering three conditions.
 
         The three conditions include technician availability, 
-        warehouse resource, and fish demand. The condition will have 
+        warehouse resource, and fish demand. The work of each sale is 
+        assigned to technicians by an 'AssignmentScheduler', so every
+        technician has their own 45 days. The condition will have 
         an interaction with Warehouse resources for fertilizer, feed, 
         and salt and Fish demand and pricing from 'fish_data'. After updating
         cash balance warehouse supplies, and fish demand after each sale,
@@ -200,22 +263,16 @@ class Hatchery:
                 f"for sale at £{fish_details['price']}"
             )
         
-        # Calculate total day base on the number of technician
-        remaining_days = len(self.technicians) * 45  
+        # Each technician has 45 working days for the work assigned to them
+        scheduler = AssignmentScheduler(self.technicians, self.fish_data)
+        remaining_days = scheduler.remaining_days
         print(
             f"\nTechnicians available: {len(self.technicians)}, " 
             f"Total working days: {remaining_days}"
         )
 
         # Keep all of resources in one variable
-        available_resources = {
-            'fertilizer': sum(warehouse.supplies['fertilizer'] for warehouse 
-                              in self.warehouses.values()),
-            'feed': sum(warehouse.supplies['feed'] for warehouse 
-                        in self.warehouses.values()),
-            'salt': sum(warehouse.supplies['salt'] for warehouse 
-                        in self.warehouses.values()),
-        }
+        available_resources = self.total_supplies()
 
         while True:
             fish_name = (
@@ -251,26 +308,25 @@ class Hatchery:
                     continue
 
                 # Calculate maintenance time for each fish type and the quantity 
-                calculation_of_maintenance_time = (
-                self.fish_data.fish_data[fish_name]['maintenance_time']
+                # and check whether technician have speciality or not
+                effectiveness_of_maintenance_time, has_specialist = (
+                    self.maintenance_time_per_unit(fish_name)
                 )
-                effectiveness_of_maintenance_time = calculation_of_maintenance_time
-
-                # Check whether technician have speciality or not
-                specialists = (
-                [tech for tech in self.technicians if tech.speciality == fish_name]
-                )
-                if specialists:
-                    effectiveness_of_maintenance_time *= 2 / 3
+                if has_specialist:
                     print(
                         f"Specialist(s) available for {fish_name}, reducing maintenance time "
-                        f"to {effectiveness_of_maintenance_time:.2f} days per unit."
+                        f"to {effectiveness_of_maintenance_time:.2f} days per unit "
+                        f"for the units they look after."
                     )
 
-                maintenance_time_required = effectiveness_of_maintenance_time * quantity
-
-                # Check whether the technician time is enough or not
-                if maintenance_time_required > remaining_days:
+                # Assign the work to technicians and check whether their time 
+                # is enough or not
+                assignment = scheduler.plan(fish_name, quantity)
+                if not assignment['feasible']:
+                    maintenance_time_required = (
+                        assignment['days'] + assignment['unassigned']
+                        * self.fish_data.fish_data[fish_name]['maintenance_time']
+                    )
                     print(f"\nInsufficient technician to sell {quantity} units of {fish_name}.")
                     print(
                         f"Requirement: {maintenance_time_required:.2f} days, "
@@ -279,31 +335,23 @@ class Hatchery:
                     continue
 
                 # Calculate the quantity of resources
-                requirement_of_fertilizer = (
-                self.fish_data.fish_data[fish_name]['fertilizer'] * quantity / 1000
-                )
-                requirement_of_feed = (
-                self.fish_data.fish_data[fish_name]['feed'] * quantity
-                )
-                requirement_of_salt = (
-                self.fish_data.fish_data[fish_name]['salt'] * quantity
-                )
+                requirements = self.resource_requirements(fish_name, quantity)
 
                 # Check the resources in the storage
                 insufficient_resources = []
-                if requirement_of_fertilizer > available_resources['fertilizer']:
+                if requirements['fertilizer'] > available_resources['fertilizer']:
                     insufficient_resources.append(
-                        f"Fertilizer: Need {requirement_of_fertilizer:.2f} "
+                        f"Fertilizer: Need {requirements['fertilizer']:.2f} "
                         f"L, available {available_resources['fertilizer']:.2f} L"
                     )
-                if requirement_of_feed > available_resources['feed']:
+                if requirements['feed'] > available_resources['feed']:
                     insufficient_resources.append(
-                        f"Feed: Need {requirement_of_feed:.2f} kg, "
+                        f"Feed: Need {requirements['feed']:.2f} kg, "
                         f"available {available_resources['feed']:.2f} kg"
                     )
-                if requirement_of_salt > available_resources['salt']:
+                if requirements['salt'] > available_resources['salt']:
                     insufficient_resources.append(
-                        f"Salt: Need {requirement_of_salt:.2f} kg, "
+                        f"Salt: Need {requirements['salt']:.2f} kg, "
                         f"available {available_resources['salt']:.2f} kg"
                     )
 
@@ -314,30 +362,16 @@ class Hatchery:
                     continue
 
                 # Reduce time and resources
-                remaining_days -= maintenance_time_required
-                for warehouse_name, warehouse_data in self.warehouses.items():
-                    used_fertilizer = min(requirement_of_fertilizer, 
-                                          warehouse_data.supplies['fertilizer'])
-                    warehouse_data.supplies['fertilizer'] -= used_fertilizer
-                    requirement_of_fertilizer -= used_fertilizer
-
-                    used_feed = min(requirement_of_feed, warehouse_data.supplies['feed'])
-                    warehouse_data.supplies['feed'] -= used_feed
-                    requirement_of_feed -= used_feed
-
-                    used_salt = min(requirement_of_salt, warehouse_data.supplies['salt'])
-                    warehouse_data.supplies['salt'] -= used_salt
-                    requirement_of_salt -= used_salt
+                scheduler.commit(assignment)
+                remaining_days = scheduler.remaining_days
+                revenue = self.complete_sale(fish_name, quantity, requirements)
+                for resource in available_resources:
+                    available_resources[resource] -= requirements[resource]
 
                 # Updating information to inform users
-                self.sales[fish_name] = self.sales.get(fish_name, 0) + quantity
-                self.cash_balance += quantity * self.fish_data.fish_data[fish_name]['price']
-                self.update_cash_balance()
-                self.fish_data.fish_data[fish_name]['demand'] -= quantity
-
                 print(
                     f"Sold {quantity} units of {fish_name} for"
-                    f"£{quantity * self.fish_data.fish_data[fish_name]['price']}."
+                    f"£{revenue}."
                 )
                 print(
                     f"Remaining technician time: {remaining_days / 5:.2f} "
@@ -357,6 +391,94 @@ class Hatchery:
             print(f"{fish}: {quantity_sold} units sold")
         print(f"Updated cash balance: £{self.cash_balance:.2f}")
     
+    def total_supplies(self):
+        """
+        Adds up the supplies of each resource over all warehouses.
+
+        Returns:
+            dict: the total amount of fertilizer, feed and salt.
+        """
+        return {
+            'fertilizer': sum(warehouse.supplies['fertilizer'] for warehouse 
+                              in self.warehouses.values()),
+            'feed': sum(warehouse.supplies['feed'] for warehouse 
+                        in self.warehouses.values()),
+            'salt': sum(warehouse.supplies['salt'] for warehouse 
+                        in self.warehouses.values()),
+        }
+
+    def maintenance_time_per_unit(self, fish_name):
+        """
+        Works out the maintenance time (in days) for one unit of a fish.
+        Specialists for that fish reduce the time to 2/3 for the units
+        that they look after.
+
+        Args:
+            fish_name (str): the name of the fish type.
+
+        Returns:
+            tuple: the time per unit and whether a specialist is available.
+        """
+        effectiveness_of_maintenance_time = (
+            self.fish_data.fish_data[fish_name]['maintenance_time']
+        )
+        has_specialist = any(
+            tech.speciality == fish_name for tech in self.technicians
+        )
+        if has_specialist:
+            effectiveness_of_maintenance_time *= 2 / 3
+        return effectiveness_of_maintenance_time, has_specialist
+
+    def resource_requirements(self, fish_name, quantity):
+        """
+        Works out the resources needed to sell a quantity of a fish.
+        Fertilizer is given per unit in ml, so it is converted to litres.
+
+        Args:
+            fish_name (str): the name of the fish type.
+            quantity (int): the number of units to sell.
+
+        Returns:
+            dict: the amount of fertilizer, feed and salt needed.
+        """
+        fish_details = self.fish_data.fish_data[fish_name]
+        return {
+            'fertilizer': fish_details['fertilizer'] * quantity / 1000,
+            'feed': fish_details['feed'] * quantity,
+            'salt': fish_details['salt'] * quantity,
+        }
+
+    def complete_sale(self, fish_name, quantity, requirements):
+        """
+        Takes the resources from the warehouses (main first) and updates
+        the sales, cash balance and fish demand for a checked sale.
+
+        Args:
+            fish_name (str): the name of the fish type.
+            quantity (int): the number of units sold.
+            requirements (dict): the resources used by the sale.
+
+        Returns:
+            int: the revenue of the sale.
+        """
+        requirements = dict(requirements)
+        for warehouse_data in self.warehouses.values():
+            for resource in ['fertilizer', 'feed', 'salt']:
+                used = min(requirements[resource], warehouse_data.supplies[resource])
+                warehouse_data.supplies[resource] -= used
+                requirements[resource] -= used
+
+        revenue = quantity * self.fish_data.fish_data[fish_name]['price']
+        self.sales[fish_name] = self.sales.get(fish_name, 0) + quantity
+        self.cash_balance += revenue
+        self.update_cash_balance()
+        self.fish_data.fish_data[fish_name]['demand'] -= quantity
+        if self.journal is not None:
+            self.journal.record(Journal.SALE, revenue, quantity, fish_name)
+        if self.report is not None:
+            self.report.add_sale(fish_name, quantity, revenue)
+        return revenue
+
     def calculate_storage_cost(self):
         """
         Calculate and deduct total warehouse cost for main 
@@ -366,40 +488,134 @@ class Hatchery:
         and auxiliary warehouses and storage cost rates for each 
         resource. After that deduct total storage cost from cash_balance. 
         """
-        total_storage_cost = 0
         print("\n=== Warehouse Cost ===")
-        
-        # Calculate Cash balance by minus fixed rent (1500)
-        self.cash_balance -= self.warehouse_cost
+        storage_costs, total_storage_cost = self.pay_storage_cost()
         print(f"Paid fixed warehouse rent: £{self.warehouse_cost:.2f}")
 
+        for warehouse_name, resource, remaining, cost in storage_costs:
+            if warehouse_name == 'main':
+                print(
+                    f"Main - {resource.capitalize()}: £{cost:.2f} "
+                    f"(Remaining: {remaining} units)"
+                )
+            else:
+                print(
+                    f"Auxiliary - {resource.capitalize()}: £{cost:.2f}" 
+                    f"(Remaining: {remaining} units)"
+                )
+
+        print(f"Total storage cost: £{total_storage_cost:.2f}")
+        print(f"Remaining cash balance after storage costs: £{self.cash_balance:.2f}")
+
+    def storage_costs(self):
+        """
+        Works out the storage cost of each resource in the main and 
+        auxiliary warehouses without changing the cash balance.
 
+        Returns:
+            list: tuples of (warehouse name, resource, units held, cost).
+        """
+        storage_costs = []
         for resource in ['fertilizer', 'feed', 'salt']:
-            remaining_main = self.warehouses['main'].supplies[resource]
-            remaining_auxiliary = self.warehouses['auxiliary'].supplies[resource]
-            
-            # Calculate main warehouse rent  
-            main_cost = (
-                remaining_main 
-                * self.warehouses['main'].storage_cost_rate[resource]
-            )
-            total_storage_cost += main_cost
-            print(
-                f"Main - {resource.capitalize()}: £{main_cost:.2f} "
-                f"(Remaining: {remaining_main} units)"
-            )
-            # Calculate auxiliary warehouse rent 
-            auxiliary_cost = (
-                remaining_auxiliary 
-                * self.warehouses['auxiliary'].storage_cost_rate[resource]
-            )
-            total_storage_cost += auxiliary_cost
-            print(
-                f"Auxiliary - {resource.capitalize()}: £{auxiliary_cost:.2f}" 
-                f"(Remaining: {remaining_auxiliary} units)"
-            )
+            for warehouse_name in ['main', 'auxiliary']:
+                warehouse = self.warehouses[warehouse_name]
+                remaining = warehouse.supplies[resource]
+                storage_costs.append((
+                    warehouse_name, resource, remaining,
+                    remaining * warehouse.storage_cost_rate[resource]
+                ))
+        return storage_costs
+
+    def pay_storage_cost(self):
+        """
+        Deducts the fixed rent (1500) and the storage cost of every 
+        resource from the cash balance without printing.
+
+        Returns:
+            tuple: the list from 'storage_costs' and the total storage cost.
+        """
+        self.cash_balance -= self.warehouse_cost
+        if self.journal is not None:
+            self.journal.record(Journal.RENT, -self.warehouse_cost)
+        if self.report is not None:
+            self.report.add_rent(self.warehouse_cost)
+
+        total_storage_cost = 0
+        storage_costs = self.storage_costs()
+        for warehouse_name, resource, remaining, cost in storage_costs:
+            total_storage_cost += cost
+            if self.journal is not None:
+                self.journal.record(
+                    Journal.STORAGE, -cost, remaining, f"{warehouse_name}:{resource}"
+                )
+            if self.report is not None:
+                self.report.add_storage(warehouse_name, resource, remaining, cost)
 
-        # Calculate cash balance by minus warehouse rent
         self.cash_balance -= total_storage_cost
-        print(f"Total storage cost: £{total_storage_cost:.2f}")
-        print(f"Remaining cash balance after storage costs: £{self.cash_balance:.2f}")
\ No newline at end of file
+        return storage_costs, total_storage_cost
+
+    def refill_amount(self, resource):
+        """
+        Works out how much of a resource is needed to fill every 
+        warehouse up to its capacity.
+
+        Args:
+            resource (str): the name of the resource.
+
+        Returns:
+            int: the amount needed (0 when the warehouses are full).
+        """
+        total_capacity = sum(
+            warehouse.capacity[resource] for warehouse in self.warehouses.values()
+        )
+        current_quantity = sum(
+            warehouse.supplies[resource] for warehouse in self.warehouses.values()
+        )
+        return max(0, total_capacity - current_quantity)
+
+    def buy_resource(self, vendor_name, resource, amount_needed):
+        """
+        Buys a resource from a vendor and stores it in the warehouses.
+
+        The main warehouse is filled first, then the auxiliary warehouse.
+        Nothing is bought when the cash balance cannot pay for the order.
+
+        Args:
+            vendor_name (str): the name of the vendor to buy from.
+            resource (str): the name of the resource to buy.
+            amount_needed (int): the amount of resource to buy.
+
+        Returns:
+            tuple: the amount stored and the cost, or None when the 
+                   cash balance is not enough.
+        """
+        vendor = self.vendors[vendor_name]
+        cost = vendor.calculate_cost(resource, amount_needed)
+        if self.cash_balance < cost:
+            return None
+
+        self.cash_balance -= cost
+        remaining_amount_needed = amount_needed
+        stored = {}
+        for warehouse_name, warehouse in self.warehouses.items():
+            before = remaining_amount_needed
+            remaining_amount_needed = warehouse.refill_resources(
+                resource, remaining_amount_needed
+            )
+            stored[warehouse_name] = before - remaining_amount_needed
+            if remaining_amount_needed == 0:
+                break
+
+        purchased = amount_needed - remaining_amount_needed
+        if self.journal is not None:
+            self.journal.record(
+                Journal.PURCHASE, -cost, purchased, f"{vendor_name}:{resource}"
+            )
+            for warehouse_name, units in stored.items():
+                if units:
+                    self.journal.record(
+                        Journal.RESTOCK, 0, units, f"{warehouse_name}:{resource}"
+                    )
+        if self.report is not None:
+            self.report.add_purchase(vendor_name, resource, purchased, cost)
+        return purchased, cost
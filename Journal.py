@@ -0,0 +1,411 @@
+"""
+Filename: journal.py
+Date: 19 October 2026
+Description:
+    This module defines the Journal class, which keeps an append-only
+    binary record of every cash movement of the hatchery, and a replay
+    tool that rebuilds the state of any quarter from that record.
+"""
+
+import os
+import struct
+import sys
+import warnings
+
+"""
+The 'struct' module packs each transaction into a fixed-size binary
+record, so the journal can be written in large batches and read back
+without any parsing.
+"""
+
+
+class Journal:
+    """
+    This class is made for writing the transaction journal of a hatchery.
+
+    Purpose:
+    - To keep every sale, rent, storage cost, payroll and purchase after
+      it has been printed, so that auditors can check it later.
+    - To keep the units lost to depreciation and the units stored by
+      each purchase, so that the supplies can be rebuilt too.
+    - To keep writing cheap by collecting records in memory and writing
+      them to the file in batches, with a periodic fsync.
+
+    Each record stores the transaction type, the quarter, the signed
+    change of the cash balance, a quantity and a short label (for
+    example the fish name or 'main:feed'). Labels longer than
+    LABEL_SIZE bytes are cut at a character boundary with a warning.
+
+    Attributes:
+    - path (str): the file the journal is appended to.
+    - batch_size (int): the number of records collected before writing.
+    - fsync_every (int): the number of batch writes between two fsyncs.
+    - quarter (int): the quarter that new records belong to.
+    """
+
+    # Transaction types
+    OPEN = 0
+    QUARTER_START = 1
+    SALE = 2
+    RENT = 3
+    STORAGE = 4
+    PAYROLL = 5
+    PURCHASE = 6
+    QUARTER_END = 7
+    DEPRECIATION = 8
+    RESTOCK = 9
+
+    TYPE_NAMES = {
+        OPEN: 'open',
+        QUARTER_START: 'quarter_start',
+        SALE: 'sale',
+        RENT: 'rent',
+        STORAGE: 'storage',
+        PAYROLL: 'payroll',
+        PURCHASE: 'purchase',
+        QUARTER_END: 'quarter_end',
+        DEPRECIATION: 'depreciation',
+        RESTOCK: 'restock',
+    }
+
+    MAGIC = b'FHJ1'
+    LABEL_SIZE = 32
+    # type, quarter, amount, quantity, label
+    RECORD = struct.Struct(f'<BIdd{LABEL_SIZE}s')
+
+    def __init__(self, path, batch_size=256, fsync_every=16):
+        """
+        Opens the journal file for appending and starts a new session.
+
+        A record that was only partly written at the end of an existing
+        file, for example after a crash, is cut off with a warning before
+        anything is appended, so that new records stay aligned.
+
+        Args:
+            path (str): the file to append the journal to.
+            batch_size (int): records to collect before writing (default 256).
+            fsync_every (int): batch writes between fsyncs (default 16).
+
+        Raises:
+            ValueError: when the file exists but is not a hatchery journal.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.fsync_every = fsync_every
+        self.quarter = 0
+        self._buffer = bytearray()
+        self._pending = 0
+        self._writes_since_sync = 0
+
+        self._file = open(path, 'ab')
+        size = self._file.tell()
+        if size > 0:
+            try:
+                size = self._check_existing(size)
+            except ValueError:
+                self._file.close()
+                raise
+        if size == 0:
+            self._file.write(self.MAGIC)
+
+    def _check_existing(self, size):
+        """
+        Checks the magic bytes of an existing file and cuts off a record
+        that was only partly written at its end.
+
+        Returns:
+            int: the size of the file that is kept.
+        """
+        with open(self.path, 'rb') as file:
+            magic = file.read(len(self.MAGIC))
+        if size < len(self.MAGIC) and self.MAGIC.startswith(magic):
+            # The crash happened while the magic bytes were written
+            warnings.warn(f"'{self.path}' has no complete header; it was started again.")
+            self._file.truncate(0)
+            return 0
+        if magic != self.MAGIC:
+            raise ValueError(f"'{self.path}' is not a hatchery journal.")
+
+        incomplete = (size - len(self.MAGIC)) % self.RECORD.size
+        if incomplete:
+            warnings.warn(
+                f"'{self.path}' ends with an incomplete record of {incomplete} "
+                f"bytes, which was cut off before appending."
+            )
+            self._file.truncate(size - incomplete)
+        return size - incomplete
+
+    def record(self, kind, amount, quantity=0, label=''):
+        """
+        Adds one transaction to the journal buffer.
+
+        Args:
+            kind (int): the transaction type, for example Journal.SALE.
+            amount (float): the change of the cash balance (negative for costs).
+            quantity (float): the number of units involved (default 0).
+            label (str): a short description such as the fish name.
+        """
+        encoded = label.encode('utf-8')
+        if len(encoded) > self.LABEL_SIZE:
+            # Cut whole characters only, so the label can still be decoded
+            encoded = encoded[:self.LABEL_SIZE].decode('utf-8', errors='ignore').encode('utf-8')
+            warnings.warn(
+                f"The label '{label}' is longer than {self.LABEL_SIZE} bytes and "
+                f"was cut to '{encoded.decode('utf-8')}'; labels that start the "
+                f"same way can no longer be told apart.",
+                stacklevel=2,
+            )
+        self._buffer += self.RECORD.pack(kind, self.quarter, amount, quantity, encoded)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def open_session(self, cash_balance):
+        """
+        Records the opening cash balance of a new simulation run.
+        """
+        self.quarter = 0
+        self.record(self.OPEN, cash_balance)
+
+    def begin_quarter(self, quarter, cash_balance):
+        """
+        Starts a new quarter and records the cash balance at its start.
+        """
+        self.quarter = quarter
+        self.record(self.QUARTER_START, cash_balance)
+
+    def end_quarter(self, cash_balance):
+        """
+        Records the cash balance at the end of the current quarter.
+        """
+        self.record(self.QUARTER_END, cash_balance)
+
+    def flush(self, sync=False):
+        """
+        Writes all buffered records to the file in one call.
+
+        The file is synced to disk every 'fsync_every' writes, or straight
+        away when 'sync' is True.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+            self._pending = 0
+            self._writes_since_sync += 1
+        self._file.flush()
+        if sync or self._writes_since_sync >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._writes_since_sync = 0
+
+    def close(self):
+        """
+        Writes the remaining records, syncs them to disk and closes the file.
+        """
+        if self._file.closed:
+            return
+        self.flush(sync=True)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_journal(path):
+    """
+    Reads every record of a journal file.
+
+    A record that was only partly written at the end of the file, for
+    example after a crash, is left out with a warning.
+
+    Args:
+        path (str): the journal file to read.
+
+    Returns:
+        list: one dictionary per record with the keys 'kind', 'quarter',
+              'amount', 'quantity' and 'label'.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if data[:len(Journal.MAGIC)] != Journal.MAGIC:
+        raise ValueError(f"'{path}' is not a hatchery journal.")
+
+    body = data[len(Journal.MAGIC):]
+    incomplete = len(body) % Journal.RECORD.size
+    if incomplete:
+        warnings.warn(
+            f"'{path}' ends with an incomplete record of {incomplete} bytes, "
+            f"which was left out."
+        )
+        body = body[:-incomplete]
+
+    records = []
+    for kind, quarter, amount, quantity, label in Journal.RECORD.iter_unpack(body):
+        records.append({
+            'kind': kind,
+            'quarter': quarter,
+            'amount': amount,
+            'quantity': quantity,
+            'label': label.rstrip(b'\0').decode('utf-8', errors='replace'),
+        })
+    return records
+
+
+def replay(path, quarter=None, session=-1):
+    """
+    Rebuilds the state of the hatchery at the end of a quarter.
+
+    Every simulation run starts a new session in the journal. The cash
+    balance is rebuilt by applying every transaction of the session up
+    to and including the chosen quarter, rounded at the same points as
+    the Hatchery class: after each sale and after the total payment of
+    the technicians. Storage costs and payments are taken as one total,
+    like in the Hatchery class.
+
+    The supplies of each warehouse are rebuilt from the units held when
+    storage was paid, minus the units lost to depreciation, plus the
+    units stored by each purchase.
+
+    Args:
+        path (str): the journal file to read.
+        quarter (int): the quarter to rebuild, or None for the last one.
+        session (int): the index of the session to use (default last).
+
+    Returns:
+        dict: the rebuilt state, including the cash balance, the
+              supplies of each warehouse (None before storage was first
+              paid), the transactions totals of the quarter and the
+              checkpoint balance written by the simulation (if any).
+
+    Raises:
+        ValueError: when the journal or the quarter cannot be found.
+    """
+    sessions = []
+    for entry in read_journal(path):
+        if entry['kind'] == Journal.OPEN:
+            sessions.append([])
+        if sessions:
+            sessions[-1].append(entry)
+
+    if not sessions:
+        raise ValueError(f"No session found in '{path}'.")
+    records = sessions[session]
+
+    quarters = {entry['quarter'] for entry in records[1:]}
+    if quarter is None:
+        quarter = max(quarters, default=0)
+    elif quarter not in quarters:
+        raise ValueError(f"Quarter {quarter} is not in the session.")
+
+    state = {
+        'quarter': quarter,
+        'opening_balance': records[0]['amount'],
+        'cash_balance': records[0]['amount'],
+        'checkpoint_balance': None,
+        'supplies': None,
+        'sales': {},
+        'revenue': 0,
+        'rent': 0,
+        'storage_cost': 0,
+        'payroll': 0,
+        'purchases': 0,
+    }
+
+    # Consecutive storage costs or payments that are applied as one total
+    pending_kind = None
+    pending = 0
+
+    def settle():
+        nonlocal pending_kind, pending
+        if pending_kind is not None:
+            state['cash_balance'] += pending
+            if pending_kind == Journal.PAYROLL:
+                state['cash_balance'] = round(state['cash_balance'], 2)
+        pending_kind = None
+        pending = 0
+
+    for entry in records[1:]:
+        if entry['quarter'] > quarter:
+            break
+        kind = entry['kind']
+        if kind != pending_kind:
+            settle()
+        if kind == Journal.QUARTER_START:
+            # Only keep the totals of the chosen quarter
+            if entry['quarter'] == quarter:
+                state['sales'] = {}
+                for key in ('revenue', 'rent', 'storage_cost', 'payroll', 'purchases'):
+                    state[key] = 0
+            continue
+        if kind == Journal.QUARTER_END:
+            if entry['quarter'] == quarter:
+                state['checkpoint_balance'] = entry['amount']
+            continue
+
+        if kind in (Journal.STORAGE, Journal.DEPRECIATION, Journal.RESTOCK):
+            warehouse_name, resource = entry['label'].split(':', 1)
+            if kind == Journal.STORAGE:
+                if state['supplies'] is None:
+                    state['supplies'] = {}
+                units = entry['quantity']
+            elif kind == Journal.RESTOCK:
+                units = state['supplies'][warehouse_name][resource] + entry['quantity']
+            else:
+                units = state['supplies'][warehouse_name][resource] - entry['quantity']
+            state['supplies'].setdefault(warehouse_name, {})[resource] = units
+
+        if kind in (Journal.STORAGE, Journal.PAYROLL):
+            pending_kind = kind
+            pending += entry['amount']
+        else:
+            state['cash_balance'] += entry['amount']
+
+        if kind == Journal.SALE:
+            state['cash_balance'] = round(state['cash_balance'], 2)
+            state['sales'][entry['label']] = (
+                state['sales'].get(entry['label'], 0) + int(entry['quantity'])
+            )
+            state['revenue'] += entry['amount']
+        elif kind == Journal.RENT:
+            state['rent'] -= entry['amount']
+        elif kind == Journal.STORAGE:
+            state['storage_cost'] -= entry['amount']
+        elif kind == Journal.PAYROLL:
+            state['payroll'] -= entry['amount']
+        elif kind == Journal.PURCHASE:
+            state['purchases'] -= entry['amount']
+
+    settle()
+    return state
+
+
+if __name__ == "__main__":
+    # Usage: python Journal.py <journal file> [quarter]
+    if len(sys.argv) < 2:
+        print("Usage: python Journal.py <journal file> [quarter]")
+        sys.exit(1)
+
+    chosen_quarter = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    try:
+        rebuilt = replay(sys.argv[1], chosen_quarter)
+    except ValueError as error:
+        print(error)
+        sys.exit(1)
+
+    print(f"=== Replay of Quarter {rebuilt['quarter']} ===")
+    for fish, quantity_sold in rebuilt['sales'].items():
+        print(f"{fish}: {quantity_sold} units sold")
+    print(f"Revenue: £{rebuilt['revenue']:.2f}")
+    print(f"Rent: £{rebuilt['rent']:.2f}")
+    print(f"Storage cost: £{rebuilt['storage_cost']:.2f}")
+    print(f"Technician payment: £{rebuilt['payroll']:.2f}")
+    print(f"Purchases: £{rebuilt['purchases']:.2f}")
+    if rebuilt['supplies'] is not None:
+        for warehouse_name, supplies in rebuilt['supplies'].items():
+            print(f"{warehouse_name.capitalize()} supplies: {supplies}")
+    print(f"Rebuilt cash balance: £{rebuilt['cash_balance']:.2f}")
+    if rebuilt['checkpoint_balance'] is not None:
+        print(f"Recorded cash balance: £{rebuilt['checkpoint_balance']:.2f}")
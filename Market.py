@@ -0,0 +1,327 @@
+"""
+Filename: market.py
+Date: 19 October 2026
+Description:
+    This module defines the Market class, which sets the price of each
+    fish type from the quantity offered by many hatcheries, and the
+    Competition class, which runs many hatcheries that sell into the
+    same market every quarter.
+"""
+
+import bisect
+import copy
+import itertools
+import math
+import time
+
+from Report import ReportBook
+from Simulation import Simulation, build_hatchery
+
+"""
+The 'bisect' and 'itertools' modules search and add up the sorted offers
+of all hatcheries at once, instead of going through the hatcheries one
+by one while the market is cleared.
+"""
+
+# The price elasticity of demand used when none is given
+DEFAULT_ELASTICITY = 1.5
+
+
+class Market:
+    """
+    This class is made for clearing the market of each fish type.
+
+    Purpose:
+    - To make the price of a fish respond to the quantity sold, with a
+      demand curve of constant elasticity for each fish type.
+    - To share one pool of demand between all the hatcheries.
+
+    At the price p, buyers want D(p) = D0 * (p / p0) ** -e units, where
+    p0 is the price of the fish in the 'Fish' class, D0 is the demand of
+    the fish times the number of hatcheries, and e is the elasticity.
+
+    Every hatchery offers a quantity and the lowest price it accepts.
+    Offers are sorted by that price and the clearing price is where the
+    units offered meet the demand curve. Offers below the clearing price
+    are sold in full, and offers at the clearing price share what is
+    left of the demand in proportion to their quantities.
+
+    Attributes:
+    - base_price (dict): the price p0 of each fish type.
+    - base_demand (dict): the demand D0 of each fish type.
+    - elasticity (dict): the elasticity e of each fish type.
+    - history (list): the price and units sold of each fish type in
+      every quarter that was cleared.
+    """
+
+    def __init__(self, fish_data, participants, elasticity=DEFAULT_ELASTICITY,
+                 demand_scale=1.0):
+        """
+        Beginning a market.
+
+        Args:
+            fish_data (object): the 'Fish' object with prices and demand.
+            participants (int): the number of hatcheries in the market.
+            elasticity (float or dict): e, for all or for each fish type.
+            demand_scale (float): a factor for the total demand (default 1).
+        """
+        self.base_price = {
+            fish_name: fish_details['price']
+            for fish_name, fish_details in fish_data.fish_data.items()
+        }
+        self.base_demand = {
+            fish_name: demand * participants * demand_scale
+            for fish_name, demand in fish_data.default_demand.items()
+        }
+        if not isinstance(elasticity, dict):
+            elasticity = {fish_name: elasticity for fish_name in self.base_price}
+        self.elasticity = elasticity
+        self.history = []
+
+    def demand_at(self, fish_name, price):
+        """
+        Works out the units that buyers want at a price.
+        """
+        if self.base_demand[fish_name] <= 0:
+            return 0
+        return self.base_demand[fish_name] * (
+            price / self.base_price[fish_name]
+        ) ** -self.elasticity[fish_name]
+
+    def price_at(self, fish_name, quantity):
+        """
+        Works out the price at which buyers take a quantity.
+        Without demand, buyers do not take any quantity at any price.
+        """
+        if quantity <= 0:
+            return math.inf
+        if self.base_demand[fish_name] <= 0:
+            return 0
+        return self.base_price[fish_name] * (
+            quantity / self.base_demand[fish_name]
+        ) ** (-1 / self.elasticity[fish_name])
+
+    def clear(self, fish_name, quantities, reserves):
+        """
+        Clears the market of a fish type for one quarter.
+
+        Args:
+            fish_name (str): the name of the fish type.
+            quantities (list): the units offered by each hatchery.
+            reserves (list): the lowest price each hatchery accepts.
+
+        Returns:
+            tuple: the clearing price and the list of units sold by each
+                   hatchery, in the same order as the offers. Units are
+                   rounded down to whole fish. Without demand, nothing is
+                   sold and the price is the base price.
+        """
+        count = len(quantities)
+        order = sorted(range(count), key=reserves.__getitem__)
+        sorted_reserves = [reserves[index] for index in order]
+        sorted_quantities = [quantities[index] for index in order]
+        # supplied[k] is the units of the k cheapest offers
+        supplied = [0] + list(itertools.accumulate(sorted_quantities))
+
+        if supplied[-1] <= 0 or self.base_demand[fish_name] <= 0:
+            return self.base_price[fish_name], [0] * count
+
+        # The number of offers that are sold in full: the largest k where
+        # the k-th offer accepts the price of the first k offers
+        low, high = 0, count
+        while low < high:
+            middle = (low + high + 1) // 2
+            if sorted_reserves[middle - 1] <= self.price_at(fish_name, supplied[middle]):
+                low = middle
+            else:
+                high = middle - 1
+        accepted = low
+
+        if accepted == count or sorted_reserves[accepted] >= self.price_at(
+                fish_name, supplied[accepted]):
+            # The next offer asks more than buyers pay for the accepted units
+            price = self.price_at(fish_name, supplied[accepted])
+            start = end = accepted
+            share = 0
+        else:
+            # The next offers set the price and share the demand left
+            price = sorted_reserves[accepted]
+            start = bisect.bisect_left(sorted_reserves, price)
+            end = bisect.bisect_right(sorted_reserves, price)
+            share = min(1, max(0, (
+                (self.demand_at(fish_name, price) - supplied[start])
+                / (supplied[end] - supplied[start])
+            )))
+
+        sorted_sales = (
+            sorted_quantities[:start]
+            + [math.floor(quantity * share) for quantity in sorted_quantities[start:end]]
+            + [0] * (count - end)
+        )
+        sales = [0] * count
+        for index, units in zip(order, sorted_sales):
+            sales[index] = units
+        return price, sales
+
+
+class Competition:
+    """
+    This class runs many hatcheries that compete in one market.
+
+    Every quarter each hatchery works out the largest quantities it can
+    sell with its technicians and supplies, up to its own demand in the
+    'Fish' class as in main.py, the market is cleared for
+    every fish type, and then each hatchery runs its quarter with the
+    same steps as main.py, selling the units the market gave it at the
+    clearing price. Hatcheries that go bankrupt leave the market.
+
+    Attributes:
+    - market (object): the 'Market' shared by the hatcheries.
+    - simulations (list): the 'Simulation' of each hatchery.
+    - reserves (list): the lowest price of each hatchery, as a fraction
+      of the base price of the fish.
+    """
+
+    def __init__(self, hatcheries, market, vendor_name='Slippery Lakes',
+                 sell_orders=None, reserve_fraction=0.5, policy=None):
+        """
+        Beginning a competition.
+
+        Args:
+            hatcheries (list): the 'Hatchery' objects that compete.
+            market (object): the 'Market' to sell into.
+            vendor_name (str): the vendor to buy from (default 'Slippery Lakes').
+            sell_orders (list): the fish types to offer, see 'Simulation'.
+                                Quantities are set by the market.
+            reserve_fraction (float or list): the lowest price of every
+                                              hatchery, or of each one.
+            policy (object): the inventory policy, copied for each hatchery.
+        """
+        self.market = market
+        self.simulations = [
+            Simulation(
+                hatchery, vendor_name, sell_orders,
+                ReportBook(keep_quarters=False), copy.deepcopy(policy),
+            )
+            for hatchery in hatcheries
+        ]
+        # The most each hatchery offers of each fish in a quarter
+        self._limits = [dict(hatchery.fish_data.default_demand) for hatchery in hatcheries]
+        if not isinstance(reserve_fraction, list):
+            reserve_fraction = [reserve_fraction] * len(hatcheries)
+        self.reserves = reserve_fraction
+        self._fish_names = [
+            fish_name for fish_name in market.base_price
+            if sell_orders is None or fish_name in {order[0] for order in sell_orders}
+        ]
+
+    def run(self, number_of_quarters):
+        """
+        Runs quarters until the last one or until every hatchery is bankrupt.
+
+        Returns:
+            list: the market history of the quarters.
+        """
+        for _ in range(number_of_quarters):
+            if not self.run_quarter():
+                break
+        return self.market.history
+
+    def run_quarter(self):
+        """
+        Clears the market and runs one quarter of every active hatchery.
+
+        Returns:
+            bool: False when no hatchery is left in the market.
+        """
+        active = [
+            (position, simulation) for position, simulation in enumerate(self.simulations)
+            if not simulation.bankrupt
+        ]
+        if not active:
+            return False
+
+        # The units each hatchery can offer
+        offers = []
+        for position, simulation in active:
+            fish = simulation.hatchery.fish_data
+            for fish_name, limit in self._limits[position].items():
+                fish.fish_data[fish_name]['demand'] = limit
+            simulation.sell_orders = [(fish_name, None) for fish_name in self._fish_names]
+            offered = {}
+            for fish_name, quantity, _ in simulation.plan_sales():
+                offered[fish_name] = offered.get(fish_name, 0) + quantity
+            offers.append(offered)
+
+        quarter = {}
+        sales = [{} for _ in active]
+        for fish_name in self._fish_names:
+            base_price = self.market.base_price[fish_name]
+            price, units = self.market.clear(
+                fish_name,
+                [offered.get(fish_name, 0) for offered in offers],
+                [self.reserves[position] * base_price for position, _ in active],
+            )
+            quarter[fish_name] = (price, sum(units))
+            for sold, amount in zip(sales, units):
+                sold[fish_name] = amount
+        self.market.history.append(quarter)
+
+        # Each hatchery sells what the market gave it at the clearing price
+        for (_, simulation), sold in zip(active, sales):
+            fish = simulation.hatchery.fish_data
+            for fish_name, amount in sold.items():
+                fish.fish_data[fish_name]['price'] = quarter[fish_name][0]
+                fish.default_demand[fish_name] = amount
+            simulation.sell_orders = [
+                (fish_name, amount) for fish_name, amount in sold.items() if amount > 0
+            ]
+            simulation.run_quarter()
+        return True
+
+    def market_shares(self):
+        """
+        Works out the share of the total revenue of each hatchery.
+
+        Returns:
+            list: the revenue share of each hatchery, in the same order.
+        """
+        revenues = [
+            simulation.report_book.rollup.revenue for simulation in self.simulations
+        ]
+        total = sum(revenues)
+        if total == 0:
+            return [0] * len(revenues)
+        return [revenue / total for revenue in revenues]
+
+
+if __name__ == "__main__":
+    number_of_hatcheries = 2000
+    technicians = [[('Anna', None)], [('Anna', None), ('Ben', 'Modal Bass')],
+                   [('Anna', None), ('Ben', None), ('Cara', None)]]
+    hatcheries = [
+        build_hatchery(10000, technicians[index % len(technicians)])
+        for index in range(number_of_hatcheries)
+    ]
+    # Buyers want 70% of what the hatcheries can offer at the base prices
+    market = Market(hatcheries[0].fish_data, number_of_hatcheries, demand_scale=0.7)
+    competition = Competition(
+        hatcheries, market,
+        reserve_fraction=[0.4 + 0.1 * (index % 5) for index in range(number_of_hatcheries)],
+    )
+
+    start = time.perf_counter()
+    history = competition.run(4)
+    elapsed = time.perf_counter() - start
+
+    print(f"=== Market of {number_of_hatcheries} Hatcheries ({elapsed:.2f} s) ===")
+    for quarter, prices in enumerate(history, 1):
+        print(f"Quarter {quarter}:")
+        for fish_name, (price, units) in prices.items():
+            print(f" - {fish_name}: {units} units at £{price:.2f}")
+    shares = competition.market_shares()
+    for size in range(len(technicians)):
+        share = sum(shares[size::len(technicians)])
+        print(f"Hatcheries with {size + 1} technician(s): {share:.1%} of revenue")
+    bankrupt = sum(simulation.bankrupt for simulation in competition.simulations)
+    print(f"Bankrupt: {bankrupt}")
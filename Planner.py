@@ -0,0 +1,257 @@
+"""
+Filename: planner.py
+Date: 19 October 2026
+Description:
+    This module defines the CapacityPlanner class, which tries many
+    warehouse capacity configurations and finds the ones that give the
+    best trade-off between profit and storage cost.
+"""
+
+import itertools
+
+from Hatchery import DEFAULT_CAPACITIES
+from Report import QuarterReport
+from Simulation import Simulation, build_hatchery
+
+
+class CapacityPlanner:
+    """
+    This class is made for sizing the warehouses of the hatchery.
+
+    Purpose:
+    - To evaluate thousands of capacity configurations over a number of
+      quarters and report the Pareto frontier of profit against storage cost.
+    - To share work between the configurations instead of running every
+      one of them from scratch.
+
+    Sales, storage cost, depreciation and technician payment only depend
+    on the supplies held at the start of a quarter, not on the capacity
+    or the cash balance. Their outcome is worked out once for each
+    starting supplies and kept in a cache that every configuration uses.
+    Because supplies are refilled to capacity, most quarters of a
+    configuration start with the same supplies, so after the first
+    quarter only the refill step has to be simulated.
+
+    Attributes:
+    - cash_balance (float): the starting cash balance of every hatchery.
+    - technicians (list): (name, speciality) of the technicians to hire.
+    - vendor_name (str): the vendor that supplies are bought from.
+    - number_of_quarters (int): the number of quarters to simulate.
+    - sell_orders (list): the orders placed every quarter, see 'Simulation'.
+    """
+
+    def __init__(self, cash_balance=10000, technicians=None,
+                 vendor_name='Slippery Lakes', number_of_quarters=8,
+                 sell_orders=None):
+        """
+        Beginning a planner with the settings shared by every configuration.
+
+        Args:
+            cash_balance (float): the starting cash balance (default 10000).
+            technicians (list): (name, speciality) pairs, by default three
+                                technicians without speciality.
+            vendor_name (str): the vendor to buy from (default 'Slippery Lakes').
+            number_of_quarters (int): the quarters to simulate (default 8).
+            sell_orders (list): orders for every quarter (default sell
+                                as much as possible of every fish).
+        """
+        if technicians is None:
+            technicians = [('Technician 1', None), ('Technician 2', None),
+                           ('Technician 3', None)]
+        self.cash_balance = cash_balance
+        self.technicians = technicians
+        self.vendor_name = vendor_name
+        self.number_of_quarters = number_of_quarters
+        self.sell_orders = sell_orders
+        self._outcomes = {}
+        self._scratch = self.new_hatchery(DEFAULT_CAPACITIES)
+
+    def new_hatchery(self, capacities):
+        """
+        Creates a hatchery with the given capacities and the technicians
+        of the planner.
+
+        Args:
+            capacities (dict): the capacities of the 'main' and 'auxiliary' warehouses.
+
+        Returns:
+            object: the new 'Hatchery'.
+        """
+        return build_hatchery(self.cash_balance, self.technicians, capacities)
+
+    def quarter_outcome(self, supplies):
+        """
+        Works out the sales, storage cost, depreciation and technician
+        payment of a quarter that starts with the given supplies.
+        The result is cached, so it is only worked out once.
+
+        Args:
+            supplies (tuple): the supplies of each warehouse, as made by
+                              '_supplies_key'.
+
+        Returns:
+            object: a 'QuarterReport' with the numbers of the quarter.
+        """
+        outcome = self._outcomes.get(supplies)
+        if outcome is not None:
+            return outcome
+
+        hatchery = self._scratch
+        for warehouse, warehouse_supplies in zip(hatchery.warehouses.values(), supplies):
+            warehouse.supplies = dict(zip(_RESOURCES, warehouse_supplies))
+        hatchery.sales = {}
+        hatchery.fish_data.reset_fish_demand()
+        hatchery.report = outcome = QuarterReport(0, 0)
+
+        Simulation(hatchery, sell_orders=self.sell_orders).sell()
+        hatchery.pay_storage_cost()
+        hatchery.apply_depreciation()
+        hatchery.pay_technicians()
+        hatchery.report = None
+
+        self._outcomes[supplies] = outcome
+        return outcome
+
+    def evaluate(self, capacities):
+        """
+        Simulates one capacity configuration for 'number_of_quarters'.
+
+        Args:
+            capacities (dict): the capacities of the 'main' and 'auxiliary' warehouses.
+
+        Returns:
+            dict: the capacities, profit, revenue, storage cost, purchase
+                  cost, number of quarters completed and whether the
+                  hatchery went bankrupt.
+        """
+        hatchery = self.new_hatchery(capacities)
+        simulation = Simulation(hatchery, self.vendor_name)
+        result = {
+            'capacities': capacities,
+            'profit': 0,
+            'revenue': 0,
+            'storage_cost': 0,
+            'purchase_cost': 0,
+            'quarters': 0,
+            'bankrupt': False,
+        }
+
+        for _ in range(self.number_of_quarters):
+            outcome = self.quarter_outcome(_supplies_key(hatchery))
+            result['revenue'] += outcome.revenue
+            result['storage_cost'] += outcome.storage_cost
+
+            # Apply the cached outcome with the same checks as main.py
+            for units, revenue in outcome.sales.values():
+                hatchery.cash_balance += revenue
+                hatchery.update_cash_balance()
+            hatchery.cash_balance -= outcome.rent
+            hatchery.cash_balance -= outcome.storage_cost
+            if hatchery.cash_balance < 0:
+                result['bankrupt'] = True
+                break
+            hatchery.cash_balance -= outcome.payroll_cost
+            hatchery.update_cash_balance()
+            if hatchery.cash_balance < 0:
+                result['bankrupt'] = True
+                break
+            for name, warehouse in hatchery.warehouses.items():
+                warehouse.supplies = dict(outcome.depreciation[name])
+
+            cash_before_restock = hatchery.cash_balance
+            simulation.restock()
+            result['purchase_cost'] += cash_before_restock - hatchery.cash_balance
+            result['quarters'] += 1
+
+        result['profit'] = hatchery.cash_balance - self.cash_balance
+        return result
+
+    def evaluate_all(self, candidates):
+        """
+        Evaluates many capacity configurations.
+
+        Args:
+            candidates (iterable): capacity configurations, for example
+                                   from 'capacity_grid'.
+
+        Returns:
+            list: the result of 'evaluate' for each configuration.
+        """
+        return [self.evaluate(capacities) for capacities in candidates]
+
+
+def capacity_grid(scales=(0.5, 1.0, 1.5, 2.0), base=None):
+    """
+    Creates capacity configurations by scaling the capacity of each
+    resource in each warehouse by every scale.
+
+    With 4 scales there are 4 ** 6 = 4096 configurations.
+
+    Args:
+        scales (tuple): the factors applied to the base capacities.
+        base (dict): the base capacities (default the standard capacities).
+
+    Returns:
+        generator: capacity configurations for 'CapacityPlanner.evaluate'.
+    """
+    if base is None:
+        base = DEFAULT_CAPACITIES
+    slots = [(name, resource) for name in ('main', 'auxiliary') for resource in _RESOURCES]
+    for factors in itertools.product(scales, repeat=len(slots)):
+        capacities = {'main': {}, 'auxiliary': {}}
+        for (name, resource), factor in zip(slots, factors):
+            capacities[name][resource] = round(base[name][resource] * factor)
+        yield capacities
+
+
+def pareto_frontier(results):
+    """
+    Finds the results that no other result beats on both profit (higher
+    is better) and storage cost (lower is better).
+
+    Bankrupt results are left out, because their storage cost and profit
+    only cover the quarters before the hatchery went bankrupt.
+
+    Args:
+        results (list): results from 'CapacityPlanner.evaluate'.
+
+    Returns:
+        list: the frontier, from the lowest to the highest storage cost.
+    """
+    ordered = sorted(
+        (result for result in results if not result['bankrupt']),
+        key=lambda result: (result['storage_cost'], -result['profit']),
+    )
+    frontier = []
+    best_profit = None
+    for result in ordered:
+        if best_profit is None or result['profit'] > best_profit:
+            frontier.append(result)
+            best_profit = result['profit']
+    return frontier
+
+
+_RESOURCES = ('fertilizer', 'feed', 'salt')
+
+
+def _supplies_key(hatchery):
+    """
+    Turns the supplies of every warehouse into a tuple used as cache key.
+    """
+    return tuple(
+        tuple(warehouse.supplies[resource] for resource in _RESOURCES)
+        for warehouse in hatchery.warehouses.values()
+    )
+
+
+if __name__ == "__main__":
+    planner = CapacityPlanner()
+    frontier = pareto_frontier(planner.evaluate_all(capacity_grid()))
+
+    print("=== Pareto Frontier of Warehouse Capacities ===")
+    for result in frontier:
+        capacities = result['capacities']
+        print(
+            f"Main {capacities['main']}, Auxiliary {capacities['auxiliary']}: "
+            f"profit £{result['profit']:.2f}, storage cost £{result['storage_cost']:.2f}"
+        )
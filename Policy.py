@@ -0,0 +1,300 @@
+"""
+Filename: policy.py
+Date: 19 October 2026
+Description:
+    This module defines the inventory policies that decide how much of
+    each resource the hatchery buys at the end of a quarter, and a tool
+    that compares policies over many hatcheries.
+"""
+
+import math
+
+RESOURCES = ('fertilizer', 'feed', 'salt')
+
+
+class ReorderPolicy:
+    """
+    This class is the base of the inventory policies.
+
+    A policy is asked how much of each resource to buy with
+    'order_amount', and is told with 'record_purchase' when a purchase
+    has been paid for. Policies that keep a history only update it from
+    purchases that were made.
+    """
+
+    def order_amount(self, hatchery, resource, quarter):
+        """
+        Works out how much of a resource to buy at the end of a quarter.
+
+        Args:
+            hatchery (object): the 'Hatchery' that buys the resource.
+            resource (str): the name of the resource.
+            quarter (int): the number of the quarter.
+
+        Returns:
+            int: the amount to buy (0 for none).
+        """
+        raise NotImplementedError
+
+    def record_purchase(self, hatchery, resource, purchased):
+        """
+        Is called after an order has been paid for and stored.
+
+        Args:
+            hatchery (object): the 'Hatchery' that bought the resource.
+            resource (str): the name of the resource.
+            purchased (int): the amount stored in the warehouses.
+        """
+
+
+class RefillToCapacity(ReorderPolicy):
+    """
+    This policy fills every warehouse up to its capacity each quarter.
+    It is the standard behaviour of main.py.
+    """
+
+    def order_amount(self, hatchery, resource, quarter):
+        """
+        Buys enough to fill every warehouse.
+        """
+        return hatchery.refill_amount(resource)
+
+    def __repr__(self):
+        return "RefillToCapacity()"
+
+
+class MinMaxPolicy(ReorderPolicy):
+    """
+    This policy is an (s, S) policy. When the stock of a resource is at
+    or below the reorder point s, it buys up to the level S.
+
+    Levels are given as a fraction of the total capacity of the warehouses.
+
+    Attributes:
+    - reorder_point (dict): the fraction s for each resource.
+    - order_up_to (dict): the fraction S for each resource.
+    """
+
+    def __init__(self, reorder_point=0.3, order_up_to=1.0):
+        """
+        Beginning an (s, S) policy.
+
+        Args:
+            reorder_point (float or dict): s, for all or for each resource.
+            order_up_to (float or dict): S, for all or for each resource.
+        """
+        self.reorder_point = _per_resource(reorder_point)
+        self.order_up_to = _per_resource(order_up_to)
+
+    def order_amount(self, hatchery, resource, quarter):
+        """
+        Buys up to S when the stock is at or below s.
+        """
+        capacity = total_capacity(hatchery, resource)
+        stock = total_stock(hatchery, resource)
+        if stock > self.reorder_point[resource] * capacity:
+            return 0
+        return _limit(hatchery, resource, self.order_up_to[resource] * capacity - stock)
+
+    def __repr__(self):
+        return f"MinMaxPolicy({self.reorder_point}, {self.order_up_to})"
+
+
+class PeriodicReviewPolicy(ReorderPolicy):
+    """
+    This policy checks the stock every 'period' quarters and buys up to
+    the level S. Nothing is bought in the other quarters.
+
+    Attributes:
+    - period (int): the number of quarters between two reviews.
+    - order_up_to (dict): the fraction S of the capacity for each resource.
+    """
+
+    def __init__(self, period=2, order_up_to=1.0):
+        """
+        Beginning a periodic review policy.
+
+        Args:
+            period (int): quarters between reviews (default 2).
+            order_up_to (float or dict): S, for all or for each resource.
+        """
+        self.period = period
+        self.order_up_to = _per_resource(order_up_to)
+
+    def order_amount(self, hatchery, resource, quarter):
+        """
+        Buys up to S in review quarters only.
+        """
+        if (quarter - 1) % self.period != 0:
+            return 0
+        capacity = total_capacity(hatchery, resource)
+        stock = total_stock(hatchery, resource)
+        return _limit(hatchery, resource, self.order_up_to[resource] * capacity - stock)
+
+    def __repr__(self):
+        return f"PeriodicReviewPolicy({self.period}, {self.order_up_to})"
+
+
+class ForecastPolicy(ReorderPolicy):
+    """
+    This policy forecasts how much of each resource the next quarter will
+    use, with exponential smoothing of the past use, and buys enough to
+    hold the forecast times a safety factor.
+
+    The use of a quarter is the stock after the last purchase minus the
+    stock before this purchase, so it includes sales and depreciation.
+    The stock after a purchase only counts what was actually bought, so
+    an order that could not be paid for does not change the history.
+    The first quarter has no history, so it fills up to capacity.
+
+    Attributes:
+    - smoothing (float): the weight of the newest use (0 to 1).
+    - safety (float): the factor applied to the forecast.
+    - forecast (dict): the current forecast for each resource.
+    """
+
+    def __init__(self, smoothing=0.5, safety=1.2):
+        """
+        Beginning a forecast policy.
+
+        Args:
+            smoothing (float): the weight of the newest use (default 0.5).
+            safety (float): the factor applied to the forecast (default 1.2).
+        """
+        self.smoothing = smoothing
+        self.safety = safety
+        self.forecast = {}
+        self._last_stock = {}
+
+    def order_amount(self, hatchery, resource, quarter):
+        """
+        Updates the forecast with the use of this quarter and buys up to
+        the forecast times the safety factor.
+        """
+        stock = total_stock(hatchery, resource)
+        if resource not in self._last_stock:
+            amount = hatchery.refill_amount(resource)
+        else:
+            used = max(0, self._last_stock[resource] - stock)
+            if resource in self.forecast:
+                self.forecast[resource] = (
+                    self.smoothing * used
+                    + (1 - self.smoothing) * self.forecast[resource]
+                )
+            else:
+                self.forecast[resource] = used
+            amount = _limit(hatchery, resource, self.safety * self.forecast[resource] - stock)
+        # The stock without a purchase; 'record_purchase' adds what is bought
+        self._last_stock[resource] = stock
+        return amount
+
+    def record_purchase(self, hatchery, resource, purchased):
+        """
+        Adds a purchase that was paid for to the stock after this quarter.
+        """
+        self._last_stock[resource] += purchased
+
+    def __repr__(self):
+        return f"ForecastPolicy({self.smoothing}, {self.safety})"
+
+
+def total_capacity(hatchery, resource):
+    """
+    Adds up the capacity of a resource over all warehouses.
+    """
+    return sum(warehouse.capacity[resource] for warehouse in hatchery.warehouses.values())
+
+
+def total_stock(hatchery, resource):
+    """
+    Adds up the supplies of a resource over all warehouses.
+    """
+    return sum(warehouse.supplies[resource] for warehouse in hatchery.warehouses.values())
+
+
+def evaluate_policies(policies, cash_balances, number_of_quarters, technicians,
+                      vendor_name='Slippery Lakes', processes=None):
+    """
+    Runs every policy on many hatcheries and compares the results.
+
+    Each hatchery gets its own copy of the policy, so policies that keep
+    a history do not share it.
+
+    Args:
+        policies (dict): the policies to compare, by name.
+        cash_balances (list): the starting cash balance of each hatchery.
+        number_of_quarters (int): the number of quarters to simulate.
+        technicians (list): (name, speciality) pairs for every hatchery.
+        vendor_name (str): the vendor to buy from (default 'Slippery Lakes').
+        processes (int): the number of worker processes (default all CPUs).
+
+    Returns:
+        dict: for each policy, the average profit, revenue, storage cost,
+              purchase cost and depreciation loss, and the share of
+              hatcheries that went bankrupt.
+    """
+    # Imported here because SharedState uses this module through Simulation
+    from SharedState import run_parallel
+
+    summary = {}
+    for name, policy in policies.items():
+        results = run_parallel(
+            cash_balances, number_of_quarters, technicians, vendor_name,
+            policy=policy, processes=processes,
+        )
+        count = len(results)
+        summary[name] = {
+            'profit': sum(
+                result['cash_balance'] - cash_balance
+                for result, cash_balance in zip(results, cash_balances)
+            ) / count,
+            'revenue': sum(result['revenue'] for result in results) / count,
+            'storage_cost': sum(result['storage_cost'] for result in results) / count,
+            'purchase_cost': sum(result['purchase_cost'] for result in results) / count,
+            'depreciation_loss': sum(
+                result['depreciation_loss'] for result in results
+            ) / count,
+            'bankrupt': sum(result['bankrupt'] for result in results) / count,
+        }
+    return summary
+
+
+def _per_resource(value):
+    """
+    Turns one value or a dictionary into a value for each resource.
+    """
+    if isinstance(value, dict):
+        return dict(value)
+    return {resource: value for resource in RESOURCES}
+
+
+def _limit(hatchery, resource, amount):
+    """
+    Rounds an order up to whole units and keeps it between 0 and the free
+    space in the warehouses, because stock that does not fit is paid for
+    but lost.
+    """
+    return max(0, min(math.ceil(amount), hatchery.refill_amount(resource)))
+
+
+if __name__ == "__main__":
+    policies = {
+        'refill to capacity': RefillToCapacity(),
+        '(s, S) 0.3 / 1.0': MinMaxPolicy(0.3, 1.0),
+        '(s, S) 0.5 / 0.8': MinMaxPolicy(0.5, 0.8),
+        'periodic review 1 / 0.8': PeriodicReviewPolicy(1, 0.8),
+        'forecast': ForecastPolicy(),
+    }
+    summary = evaluate_policies(
+        policies, [5000 + 5 * index for index in range(1000)], 20,
+        [('Anna', None), ('Ben', 'Modal Bass')],
+    )
+
+    print("=== Inventory Policies over 1000 Hatcheries ===")
+    for name, result in summary.items():
+        print(
+            f"{name}: profit £{result['profit']:.2f}, revenue £{result['revenue']:.2f}, "
+            f"storage £{result['storage_cost']:.2f}, "
+            f"depreciation £{result['depreciation_loss']:.2f}, "
+            f"purchases £{result['purchase_cost']:.2f}, bankrupt {result['bankrupt']:.0%}"
+        )
@@ -0,0 +1,305 @@
+"""
+Filename: regression.py
+Date: 19 October 2026
+Description:
+    This module records golden traces of the hatchery for a corpus of
+    scenarios and replays them against other simulation engines, so that
+    every faster engine can be checked to give the same results.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+from Simulation import Simulation, build_hatchery
+
+"""
+The 'json' module stores the golden traces in a readable file and the
+'time' module measures the speed of each engine.
+"""
+
+# The golden traces that are kept with the code
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'tests', 'golden_traces.json')
+
+# A corpus of scenarios. Sell orders are placed every quarter.
+DEFAULT_SCENARIOS = [
+    {
+        'name': 'three technicians',
+        'cash_balance': 10000,
+        'technicians': [('Anna', None), ('Ben', None), ('Cara', None)],
+        'vendor': 'Slippery Lakes',
+        'quarters': 8,
+        'sell_orders': [('Modal Bass', 20), ('Fugue Flounder', 10), ('Timpani', 10)],
+    },
+    {
+        'name': 'specialists',
+        'cash_balance': 10000,
+        'technicians': [('Anna', 'Modal Bass'), ('Ben', 'Clef Fins')],
+        'vendor': 'Scaly Wholesaler',
+        'quarters': 8,
+        'sell_orders': [('Modal Bass', 30), ('Clef Fins', 25), ('Plagal Cod', 5)],
+    },
+    {
+        'name': 'rejected orders',
+        'cash_balance': 10000,
+        'technicians': [('Anna', None)],
+        'vendor': 'Slippery Lakes',
+        'quarters': 6,
+        'sell_orders': [('Timpani', 11), ('Modal Bass', 50), ('Clef Fins', 0),
+                        ('Andalusian Brim', 15)],
+    },
+    {
+        'name': 'bankruptcy',
+        'cash_balance': 2000,
+        'technicians': [('Anna', None), ('Ben', None), ('Cara', None),
+                        ('Dan', None), ('Eve', None)],
+        'vendor': 'Scaly Wholesaler',
+        'quarters': 8,
+        'sell_orders': [('Timpani', 2)],
+    },
+    {
+        'name': 'long run',
+        'cash_balance': 10000,
+        'technicians': [('Anna', 'Fugue Flounder'), ('Ben', None), ('Cara', None)],
+        'vendor': 'Slippery Lakes',
+        'quarters': 40,
+        'sell_orders': [('Fugue Flounder', 30), ('Plagal Cod', 20), ('Clef Fins', 10),
+                        ('Andalusian Brim', 15)],
+    },
+]
+
+
+def snapshot(hatchery, quarter, bankrupt):
+    """
+    Takes the full state of a hatchery at the end of a quarter.
+
+    Returns:
+        dict: the cash balance, sales, fish demand and warehouse supplies.
+    """
+    return {
+        'quarter': quarter,
+        'bankrupt': bankrupt,
+        'cash_balance': hatchery.cash_balance,
+        'sales': dict(hatchery.sales),
+        'demand': {
+            fish_name: fish_details['demand']
+            for fish_name, fish_details in hatchery.fish_data.fish_data.items()
+        },
+        'supplies': {
+            name: dict(warehouse.supplies)
+            for name, warehouse in hatchery.warehouses.items()
+        },
+    }
+
+
+def run_interactive(scenario):
+    """
+    Runs a scenario through the interactive methods of the Hatchery
+    class, in the same order as main.py. The answers to the prompts are
+    given through a script and all printing is thrown away.
+
+    This is the reference engine that golden traces are recorded with.
+
+    Returns:
+        list: the snapshot of every quarter.
+    """
+    hatchery = build_hatchery(scenario['cash_balance'], scenario['technicians'])
+    answers = ''.join(
+        f"{fish_name}\n{quantity}\n" for fish_name, quantity in scenario['sell_orders']
+    ) + "done\n"
+
+    trace = []
+    stdin = sys.stdin
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for quarter in range(1, scenario['quarters'] + 1):
+                sys.stdin = io.StringIO(answers)
+                hatchery.sales = {}
+                hatchery.fish_data.reset_fish_demand()
+                hatchery.sell_fish()
+
+                hatchery.calculate_storage_cost()
+                if hatchery.cash_balance < 0:
+                    trace.append(snapshot(hatchery, quarter, True))
+                    break
+                hatchery.depreciation()
+                hatchery.calculation_total_payment()
+                if hatchery.cash_balance < 0:
+                    trace.append(snapshot(hatchery, quarter, True))
+                    break
+
+                for resource in ['fertilizer', 'feed', 'salt']:
+                    amount_needed = hatchery.refill_amount(resource)
+                    if amount_needed > 0:
+                        hatchery.buy_resource(scenario['vendor'], resource, amount_needed)
+
+                bankrupt = hatchery.cash_balance < 0
+                trace.append(snapshot(hatchery, quarter, bankrupt))
+                if bankrupt:
+                    break
+    finally:
+        sys.stdin = stdin
+    return trace
+
+
+def run_headless(scenario):
+    """
+    Runs a scenario with the headless 'Simulation' engine.
+
+    Returns:
+        list: the snapshot of every quarter.
+    """
+    hatchery = build_hatchery(scenario['cash_balance'], scenario['technicians'])
+    simulation = Simulation(
+        hatchery, scenario['vendor'],
+        [tuple(order) for order in scenario['sell_orders']]
+    )
+    trace = []
+    for quarter in range(1, scenario['quarters'] + 1):
+        running = simulation.run_quarter()
+        trace.append(snapshot(hatchery, quarter, not running))
+        if not running:
+            break
+    return trace
+
+
+# The engines that can be checked, by name
+ENGINES = {
+    'interactive': run_interactive,
+    'headless': run_headless,
+}
+
+
+def record_golden(path, scenarios=None, engine=run_interactive, revision=None):
+    """
+    Records the golden traces of a corpus of scenarios to a file.
+
+    Golden traces must be recorded once, at a known revision of the code,
+    and kept unchanged. They are only recorded again when the behaviour
+    of the hatchery is changed on purpose.
+
+    Args:
+        path (str): the JSON file to write.
+        scenarios (list): the scenarios (default 'DEFAULT_SCENARIOS').
+        engine (function): the reference engine (default 'run_interactive').
+        revision (str): the revision of the code the traces come from.
+    """
+    if scenarios is None:
+        scenarios = DEFAULT_SCENARIOS
+    golden = {
+        'revision': revision,
+        'scenarios': scenarios,
+        'traces': {scenario['name']: engine(scenario) for scenario in scenarios},
+    }
+    with open(path, 'w') as file:
+        json.dump(golden, file, indent=1)
+
+
+def compare(expected, actual, tolerance=1e-6, path=''):
+    """
+    Compares two traces value by value. Numbers may differ by 'tolerance'.
+
+    Returns:
+        list: (path, expected, actual) for every difference.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in expected.keys() | actual.keys():
+            differences += compare(
+                expected.get(key), actual.get(key), tolerance, f"{path}/{key}"
+            )
+        return differences
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        differences = []
+        if len(expected) != len(actual):
+            differences.append((f"{path}/length", len(expected), len(actual)))
+        for index, (item, other) in enumerate(zip(expected, actual)):
+            differences += compare(item, other, tolerance, f"{path}/{index}")
+        return differences
+    if (isinstance(expected, (int, float)) and isinstance(actual, (int, float))
+            and not isinstance(expected, bool) and not isinstance(actual, bool)):
+        if abs(expected - actual) > tolerance:
+            return [(path, expected, actual)]
+        return []
+    if expected != actual:
+        return [(path, expected, actual)]
+    return []
+
+
+def check(path, engines, tolerance=1e-6, repeat=1):
+    """
+    Replays the golden scenarios with each engine, compares the traces
+    and measures the speed of each engine.
+
+    Args:
+        path (str): the golden JSON file.
+        engines (dict): the engines to check, by name.
+        tolerance (float): the largest allowed numeric difference.
+        repeat (int): how many times to run the corpus for timing.
+
+    Returns:
+        dict: for each engine, the list of 'differences' and the speed
+              in 'quarters_per_second'.
+    """
+    with open(path) as file:
+        golden = json.load(file)
+
+    results = {}
+    for name, engine in engines.items():
+        differences = []
+        quarters = 0
+        elapsed = 0
+        for scenario in golden['scenarios']:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                trace = engine(scenario)
+            elapsed += time.perf_counter() - start
+            quarters += len(trace) * repeat
+            # Round trip through JSON, so tuples and keys match the file
+            trace = json.loads(json.dumps(trace))
+            for difference in compare(golden['traces'][scenario['name']], trace, tolerance):
+                differences.append((scenario['name'],) + difference)
+        results[name] = {
+            'differences': differences,
+            'quarters_per_second': quarters / elapsed if elapsed else float('inf'),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    # Usage: python Regression.py record <golden file> <revision>
+    #        python Regression.py check [<golden file> [engine ...]]
+    # Without a file, 'check' uses the golden traces in the tests folder.
+    if len(sys.argv) < 2 or sys.argv[1] not in ('record', 'check') or (
+            sys.argv[1] == 'record' and len(sys.argv) < 4):
+        print("Usage: python Regression.py record <golden file> <revision>")
+        print("       python Regression.py check [<golden file> [engine ...]]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'record':
+        record_golden(sys.argv[2], revision=sys.argv[3])
+        print(f"Recorded {len(DEFAULT_SCENARIOS)} scenarios to {sys.argv[2]}")
+        sys.exit(0)
+
+    golden_path = sys.argv[2] if len(sys.argv) > 2 else GOLDEN_PATH
+    names = sys.argv[3:] or list(ENGINES)
+    with open(golden_path) as golden_file:
+        print(f"Golden traces of revision {json.load(golden_file).get('revision')}")
+    results = check(golden_path, {name: ENGINES[name] for name in names}, repeat=5)
+
+    print(f"{'Engine':<14}{'Quarters/s':>14}{'Differences':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:<14}{result['quarters_per_second']:>14.0f}"
+            f"{len(result['differences']):>14}"
+        )
+    failed = False
+    for name, result in results.items():
+        for scenario_name, field, expected, actual in result['differences'][:20]:
+            print(f"{name}: {scenario_name} {field}: expected {expected}, got {actual}")
+            failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,381 @@
+"""
+Filename: report.py
+Date: 19 October 2026
+Description:
+    This module defines the QuarterReport, Rollup and ReportBook classes,
+    which keep the raw numbers of every quarter and only turn them into
+    text, tables or CSV when a report is actually read.
+"""
+
+import csv
+import io
+
+
+class QuarterReport:
+    """
+    This class keeps the raw numbers of one quarter of the hatchery.
+
+    Purpose:
+    - To record sales, rent, storage costs, depreciation, payroll and
+      purchases as plain numbers while the quarter is simulated.
+    - To build text, tables or CSV only when they are asked for, so a
+      long simulation spends no time on reports that nobody reads.
+
+    Attributes:
+    - quarter (int): the number of the quarter.
+    - opening_balance (float): the cash balance at the start of the quarter.
+    - closing_balance (float): the cash balance at the end of the quarter.
+    - sales (dict): units sold and revenue for each fish type.
+    - rent (float): the fixed warehouse rent paid.
+    - storage (list): (warehouse, resource, units held, cost) tuples.
+    - depreciation (dict): supplies of each warehouse after depreciation.
+    - payroll (list): (technician name, payment) tuples.
+    - purchases (list): (vendor, resource, units bought, cost) tuples.
+    """
+
+    def __init__(self, quarter, opening_balance):
+        """
+        Beginning an empty report for a quarter.
+
+        Args:
+            quarter (int): the number of the quarter.
+            opening_balance (float): the cash balance at the start.
+        """
+        self.quarter = quarter
+        self.opening_balance = opening_balance
+        self.closing_balance = None
+        self.sales = {}
+        self.rent = 0
+        self.storage = []
+        self.depreciation = {}
+        self.payroll = []
+        self.purchases = []
+
+    def add_sale(self, fish_name, quantity, revenue):
+        """
+        Records a sale of a fish type.
+        """
+        units, total = self.sales.get(fish_name, (0, 0))
+        self.sales[fish_name] = (units + quantity, total + revenue)
+
+    def add_rent(self, amount):
+        """
+        Records the fixed warehouse rent.
+        """
+        self.rent += amount
+
+    def add_storage(self, warehouse_name, resource, units, cost):
+        """
+        Records the storage cost of a resource in a warehouse.
+        """
+        self.storage.append((warehouse_name, resource, units, cost))
+
+    def add_depreciation(self, warehouse_name, supplies):
+        """
+        Records the supplies left in a warehouse after depreciation.
+        """
+        self.depreciation[warehouse_name] = dict(supplies)
+
+    def add_payment(self, name, payment):
+        """
+        Records the payment of a technician.
+        """
+        self.payroll.append((name, payment))
+
+    def add_purchase(self, vendor_name, resource, units, cost):
+        """
+        Records a purchase of a resource from a vendor.
+        """
+        self.purchases.append((vendor_name, resource, units, cost))
+
+    @property
+    def revenue(self):
+        """
+        The total revenue of the fish sales.
+        """
+        return sum(total for units, total in self.sales.values())
+
+    @property
+    def storage_cost(self):
+        """
+        The total storage cost, without the fixed rent.
+        """
+        return sum(cost for _, _, _, cost in self.storage)
+
+    @property
+    def payroll_cost(self):
+        """
+        The total payment of the technicians.
+        """
+        return sum(payment for _, payment in self.payroll)
+
+    @property
+    def purchase_cost(self):
+        """
+        The total cost of the resources bought.
+        """
+        return sum(cost for _, _, _, cost in self.purchases)
+
+    @property
+    def profit(self):
+        """
+        The revenue minus every cost of the quarter.
+        """
+        return (
+            self.revenue - self.rent - self.storage_cost
+            - self.payroll_cost - self.purchase_cost
+        )
+
+    def rows(self):
+        """
+        Lists every number of the report as (section, item, quantity, amount)
+        rows. Costs have a negative amount.
+
+        Returns:
+            list: the rows of the report.
+        """
+        rows = []
+        for fish_name, (units, revenue) in self.sales.items():
+            rows.append(('sale', fish_name, units, revenue))
+        if self.rent:
+            rows.append(('rent', 'warehouse', 0, -self.rent))
+        for warehouse_name, resource, units, cost in self.storage:
+            rows.append(('storage', f"{warehouse_name}:{resource}", units, -cost))
+        for warehouse_name, supplies in self.depreciation.items():
+            for resource, units in supplies.items():
+                rows.append(('depreciation', f"{warehouse_name}:{resource}", units, 0))
+        for name, payment in self.payroll:
+            rows.append(('payroll', name, 12, -payment))
+        for vendor_name, resource, units, cost in self.purchases:
+            rows.append(('purchase', f"{vendor_name}:{resource}", units, -cost))
+        return rows
+
+    def as_text(self):
+        """
+        Builds a short text summary of the quarter.
+        """
+        lines = [f"=== Quarter {self.quarter} Summary ==="]
+        for fish_name, (units, revenue) in self.sales.items():
+            lines.append(f"{fish_name}: {units} units sold for £{revenue:.2f}")
+        lines.append(f"Revenue: £{self.revenue:.2f}")
+        lines.append(f"Rent: £{self.rent:.2f}")
+        lines.append(f"Storage cost: £{self.storage_cost:.2f}")
+        lines.append(f"Technician payment: £{self.payroll_cost:.2f}")
+        lines.append(f"Purchases: £{self.purchase_cost:.2f}")
+        lines.append(f"Profit: £{self.profit:.2f}")
+        if self.closing_balance is not None:
+            lines.append(f"Cash balance: £{self.closing_balance:.2f}")
+        return "\n".join(lines)
+
+    def as_table(self):
+        """
+        Builds a table with one line for every row of the report.
+        """
+        return _table(self.rows())
+
+    def as_csv(self):
+        """
+        Builds CSV text with one line for every row of the report.
+        """
+        return _csv(('quarter',) + _HEADER, [
+            (self.quarter,) + row for row in self.rows()
+        ])
+
+    def __str__(self):
+        return self.as_text()
+
+
+class Rollup:
+    """
+    This class adds up the reports of many quarters.
+
+    The totals are updated once when each quarter is closed, so reading
+    the rollup never has to go through the old quarters again.
+
+    Attributes:
+    - quarters (int): the number of quarters added.
+    - opening_balance (float): the cash balance at the start of the first quarter.
+    - closing_balance (float): the cash balance at the end of the last quarter.
+    - units_sold (dict): the units sold for each fish type.
+    - fish_revenue (dict): the revenue of each fish type.
+    - revenue, rent, storage_cost, payroll_cost, purchase_cost (float):
+      the totals over all quarters.
+    """
+
+    def __init__(self):
+        """
+        Beginning an empty rollup.
+        """
+        self.quarters = 0
+        self.opening_balance = None
+        self.closing_balance = None
+        self.units_sold = {}
+        self.fish_revenue = {}
+        self.revenue = 0
+        self.rent = 0
+        self.storage_cost = 0
+        self.payroll_cost = 0
+        self.purchase_cost = 0
+
+    def add(self, report):
+        """
+        Adds the numbers of a closed quarter report to the totals.
+
+        Args:
+            report (object): the 'QuarterReport' to add.
+        """
+        if self.opening_balance is None:
+            self.opening_balance = report.opening_balance
+        self.closing_balance = report.closing_balance
+        self.quarters += 1
+        for fish_name, (units, revenue) in report.sales.items():
+            self.units_sold[fish_name] = self.units_sold.get(fish_name, 0) + units
+            self.fish_revenue[fish_name] = self.fish_revenue.get(fish_name, 0) + revenue
+            self.revenue += revenue
+        self.rent += report.rent
+        self.storage_cost += report.storage_cost
+        self.payroll_cost += report.payroll_cost
+        self.purchase_cost += report.purchase_cost
+
+    @property
+    def profit(self):
+        """
+        The revenue minus every cost over all quarters.
+        """
+        return (
+            self.revenue - self.rent - self.storage_cost
+            - self.payroll_cost - self.purchase_cost
+        )
+
+    def rows(self):
+        """
+        Lists the totals as (section, item, quantity, amount) rows.
+        """
+        rows = []
+        for fish_name, units in self.units_sold.items():
+            rows.append(('sale', fish_name, units, self.fish_revenue[fish_name]))
+        rows.append(('sale', 'total', sum(self.units_sold.values()), self.revenue))
+        rows.append(('rent', 'warehouse', 0, -self.rent))
+        rows.append(('storage', 'total', 0, -self.storage_cost))
+        rows.append(('payroll', 'total', 0, -self.payroll_cost))
+        rows.append(('purchase', 'total', 0, -self.purchase_cost))
+        return rows
+
+    def as_text(self):
+        """
+        Builds a short text summary of all quarters.
+        """
+        lines = [f"=== Summary of {self.quarters} Quarters ==="]
+        for fish_name, units in self.units_sold.items():
+            lines.append(f"{fish_name}: {units} units sold")
+        lines.append(f"Revenue: £{self.revenue:.2f}")
+        lines.append(f"Rent: £{self.rent:.2f}")
+        lines.append(f"Storage cost: £{self.storage_cost:.2f}")
+        lines.append(f"Technician payment: £{self.payroll_cost:.2f}")
+        lines.append(f"Purchases: £{self.purchase_cost:.2f}")
+        lines.append(f"Profit: £{self.profit:.2f}")
+        if self.closing_balance is not None:
+            lines.append(f"Cash balance: £{self.closing_balance:.2f}")
+        return "\n".join(lines)
+
+    def as_table(self):
+        """
+        Builds a table with one line for every total.
+        """
+        return _table(self.rows())
+
+    def as_csv(self):
+        """
+        Builds CSV text with one line for every total.
+        """
+        return _csv(_HEADER, self.rows())
+
+    def __str__(self):
+        return self.as_text()
+
+
+class ReportBook:
+    """
+    This class collects the quarter reports of a simulation.
+
+    Attributes:
+    - reports (list): the closed 'QuarterReport' objects that are kept.
+    - rollup (object): the 'Rollup' of every closed quarter.
+    - keep_quarters (bool): whether old quarter reports are kept. When it
+      is False only the rollup and the last quarter are kept, which saves
+      memory in very long runs.
+    """
+
+    def __init__(self, keep_quarters=True):
+        """
+        Beginning an empty report book.
+
+        Args:
+            keep_quarters (bool): keep every quarter report (default True).
+        """
+        self.keep_quarters = keep_quarters
+        self.reports = []
+        self.rollup = Rollup()
+
+    def start_quarter(self, quarter, opening_balance):
+        """
+        Creates the report for a new quarter.
+
+        Returns:
+            object: the new 'QuarterReport'.
+        """
+        return QuarterReport(quarter, opening_balance)
+
+    def close_quarter(self, report, closing_balance):
+        """
+        Closes a quarter report and adds it to the rollup.
+
+        Args:
+            report (object): the 'QuarterReport' to close.
+            closing_balance (float): the cash balance at the end of the quarter.
+        """
+        report.closing_balance = closing_balance
+        self.rollup.add(report)
+        if self.keep_quarters:
+            self.reports.append(report)
+        else:
+            self.reports = [report]
+
+    def as_csv(self):
+        """
+        Builds CSV text with the rows of every kept quarter.
+        """
+        return _csv(('quarter',) + _HEADER, [
+            (report.quarter,) + row for report in self.reports for row in report.rows()
+        ])
+
+    def __len__(self):
+        return len(self.reports)
+
+    def __getitem__(self, index):
+        return self.reports[index]
+
+
+_HEADER = ('section', 'item', 'quantity', 'amount')
+
+
+def _table(rows):
+    """
+    Builds an aligned text table from report rows.
+    """
+    lines = [f"{'Section':<14}{'Item':<32}{'Quantity':>12}{'Amount':>14}"]
+    for section, item, quantity, amount in rows:
+        lines.append(f"{section:<14}{item:<32}{quantity:>12.2f}{amount:>14.2f}")
+    return "\n".join(lines)
+
+
+def _csv(header, rows):
+    """
+    Builds CSV text from a header and report rows. Labels with commas,
+    quotes or new lines are quoted by the 'csv' module.
+    """
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return text.getvalue().rstrip("\n")
@@ -0,0 +1,207 @@
+"""
+Filename: scheduler.py
+Date: 19 October 2026
+Description:
+    This module defines the AssignmentScheduler class, which assigns the
+    maintenance work of each sale to the technicians, taking into account
+    the 45 working days of each technician and their speciality.
+"""
+
+# Amounts smaller than this are treated as zero
+EPSILON = 1e-9
+
+
+class AssignmentScheduler:
+    """
+    This class is made for assigning maintenance work to technicians.
+
+    Purpose:
+    - To give every technician their own 45 days in a quarter, instead
+      of one shared pool of days.
+    - To use the 2/3 maintenance time of a specialist only for the units
+      that the specialist actually looks after.
+
+    The assignment is a min-cost flow from the sale orders, through the
+    fish types, to the technicians, where the cost is the number of days
+    used. A technician has at most one speciality, so the cheapest flow
+    gives each fish to its specialists first, and the rest of the work
+    to any technician at the normal time. Units can be shared between
+    technicians.
+
+    The scheduler is incremental. A new order only uses free days and,
+    when its specialists are busy with other fish, moves that other work
+    to technicians with free days. Earlier orders are not solved again.
+
+    Attributes:
+    - fish_data (object): the 'Fish' object with maintenance times.
+    - free_days (dict): the days left for each technician name.
+    - assignments (dict): the units of each fish given to each technician.
+    - speciality (dict): the speciality of each technician name.
+    """
+
+    def __init__(self, technicians, fish_data, days_per_technician=45):
+        """
+        Beginning a scheduler for a quarter.
+
+        Args:
+            technicians (list): the 'Technicians' objects of the hatchery.
+            fish_data (object): the 'Fish' object with maintenance times.
+            days_per_technician (int): the working days of each technician
+                                       in a quarter (default 45).
+        """
+        self.fish_data = fish_data
+        self.free_days = {tech.name: days_per_technician for tech in technicians}
+        self.assignments = {tech.name: {} for tech in technicians}
+        self.speciality = {tech.name: tech.speciality for tech in technicians}
+        self._order = {}
+
+    @property
+    def remaining_days(self):
+        """
+        The total days left over all technicians.
+        """
+        return sum(self.free_days.values())
+
+    def days_per_unit(self, name, fish_name):
+        """
+        Works out the days a technician needs for one unit of a fish.
+
+        Args:
+            name (str): the name of the technician.
+            fish_name (str): the name of the fish type.
+
+        Returns:
+            float: the maintenance time, 2/3 of it for a specialist.
+        """
+        days = self.fish_data.fish_data[fish_name]['maintenance_time']
+        if self.speciality[name] == fish_name:
+            days *= 2 / 3
+        return days
+
+    def technician_order(self, fish_name):
+        """
+        Splits the technicians into the specialists of a fish and the
+        others. Technicians without speciality come first among the
+        others, so specialists keep their days for their own fish.
+
+        Returns:
+            tuple: the list of specialists and the list of others.
+        """
+        order = self._order.get(fish_name)
+        if order is None:
+            specialists = [
+                name for name in self.free_days if self.speciality[name] == fish_name
+            ]
+            others = [
+                name for name in self.free_days if self.speciality[name] != fish_name
+            ]
+            others.sort(key=lambda name: self.speciality[name] is not None)
+            order = self._order[fish_name] = (specialists, others)
+        return order
+
+    def plan(self, fish_name, quantity):
+        """
+        Works out how to assign a new order without changing the schedule.
+
+        Args:
+            fish_name (str): the name of the fish type.
+            quantity (int): the number of units to look after.
+
+        Returns:
+            dict: the plan with 'changes' (technician, fish, units, days),
+                  the 'days' used, the 'unassigned' units and whether the
+                  plan is 'feasible'.
+        """
+        free_days = dict(self.free_days)
+        changes = []
+        remaining = quantity
+
+        def assign(name, fish, units):
+            days = units * self.days_per_unit(name, fish)
+            free_days[name] -= days
+            changes.append((name, fish, units, days))
+
+        def fill(name):
+            nonlocal remaining
+            units = min(remaining, free_days[name] / self.days_per_unit(name, fish_name))
+            if units > EPSILON:
+                assign(name, fish_name, units)
+                remaining -= units
+
+        specialists, others = self.technician_order(fish_name)
+
+        # 1. Free days of the specialists
+        for name in specialists:
+            fill(name)
+
+        # 2. Move other work away from the specialists to free their days
+        for name in specialists:
+            for other_fish, units_held in list(self.assignments[name].items()):
+                if remaining <= EPSILON:
+                    break
+                if other_fish == fish_name:
+                    continue
+                for destination in others:
+                    # Move only what the freed days can be used for
+                    needed_days = remaining * self.days_per_unit(name, fish_name)
+                    units = min(
+                        units_held,
+                        free_days[destination] / self.days_per_unit(destination, other_fish),
+                        needed_days / self.days_per_unit(name, other_fish),
+                    )
+                    if units <= EPSILON:
+                        continue
+                    assign(name, other_fish, -units)
+                    assign(destination, other_fish, units)
+                    units_held -= units
+                    fill(name)
+                    if remaining <= EPSILON:
+                        break
+
+        # 3. Free days of every other technician at the normal time
+        for name in others:
+            if remaining <= EPSILON:
+                break
+            fill(name)
+
+        remaining = max(0, remaining)
+        return {
+            'fish_name': fish_name,
+            'quantity': quantity,
+            'changes': changes,
+            'days': sum(days for _, _, _, days in changes),
+            'unassigned': remaining,
+            'feasible': remaining <= EPSILON,
+        }
+
+    def commit(self, plan):
+        """
+        Applies a feasible plan from 'plan' to the schedule.
+
+        Args:
+            plan (dict): the plan to apply.
+        """
+        for name, fish_name, units, days in plan['changes']:
+            self.free_days[name] -= days
+            assigned = self.assignments[name].get(fish_name, 0) + units
+            if assigned > EPSILON:
+                self.assignments[name][fish_name] = assigned
+            else:
+                self.assignments[name].pop(fish_name, None)
+
+    def assign(self, fish_name, quantity):
+        """
+        Assigns a new order if the technicians have enough time.
+
+        Args:
+            fish_name (str): the name of the fish type.
+            quantity (int): the number of units to look after.
+
+        Returns:
+            float: the days used, or None when there is not enough time.
+        """
+        plan = self.plan(fish_name, quantity)
+        if not plan['feasible']:
+            return None
+        self.commit(plan)
+        return plan['days']
@@ -0,0 +1,378 @@
+"""
+Filename: sensitivity.py
+Date: 19 October 2026
+Description:
+    This module defines the SensitivityEngine class, which measures how
+    the profit of the hatchery responds to fish prices and demand, vendor
+    prices, depreciation rates and storage cost rates.
+"""
+
+import random
+
+from Simulation import Simulation, build_hatchery
+
+"""
+The 'random' module draws the parameter samples of the Sobol design.
+"""
+
+# Parameters that change what happens to the stock. Every other parameter
+# only changes the cash value of the same sales, storage and purchases.
+PHYSICAL_KINDS = ('demand', 'depreciation')
+
+
+class SensitivityEngine:
+    """
+    This class is made for sensitivity analysis of the hatchery profit.
+
+    Purpose:
+    - To run one-at-a-time and Sobol designs, where each variant of the
+      hatchery multiplies some parameters by a factor.
+    - To share stock simulations between variants where the units sold,
+      held and bought are the same.
+
+    A parameter is named by its kind and what it applies to, for example
+    'price:Clef Fins', 'demand:Timpani', 'vendor:Slippery Lakes:feed',
+    'depreciation:fertilizer' or 'storage_rate:salt'.
+
+    Prices, vendor prices and storage rates do not change the units that
+    are sold, held or bought. Variants that only differ in those share one
+    simulation of the stock, and their profits are worked out together
+    from the recorded units. A variant is only simulated on its own when
+    a purchase it cannot afford would change its stock.
+
+    Demand and depreciation factors do change the stock, so every
+    different set of those factors needs its own stock simulation. The
+    saving is therefore large for one-at-a-time designs (24 parameters:
+    20 stock runs for 49 variants) but smaller for Sobol designs, where
+    every row draws all factors. There 'samples * (2 + d)' stock runs
+    are needed, d being the number of demand and depreciation
+    parameters, plus one cheap replay per variant. With the default
+    parameters and 16 samples that is 176 stock runs for 416 variants.
+
+    Attributes:
+    - cash_balance (float): the starting cash balance of every variant.
+    - technicians (list): (name, speciality) of the technicians to hire.
+    - vendor_name (str): the vendor that supplies are bought from.
+    - number_of_quarters (int): the number of quarters to simulate.
+    - sell_orders (list): the orders placed every quarter, see 'Simulation'.
+    - parameters (list): the names of the parameters to analyse.
+    """
+
+    def __init__(self, cash_balance=10000, technicians=None,
+                 vendor_name='Slippery Lakes', number_of_quarters=8,
+                 sell_orders=None, parameters=None):
+        """
+        Beginning an engine with the settings shared by every variant.
+
+        Args:
+            cash_balance (float): the starting cash balance (default 10000).
+            technicians (list): (name, speciality) pairs, by default two
+                                technicians without speciality, which
+                                stay solvent with the default cash.
+            vendor_name (str): the vendor to buy from (default 'Slippery Lakes').
+            number_of_quarters (int): the quarters to simulate (default 8).
+            sell_orders (list): orders for every quarter (default sell
+                                as much as possible of every fish).
+            parameters (list): the parameters to analyse (default all).
+        """
+        if technicians is None:
+            technicians = [('Technician 1', None), ('Technician 2', None)]
+        self.cash_balance = cash_balance
+        self.technicians = technicians
+        self.vendor_name = vendor_name
+        self.number_of_quarters = number_of_quarters
+        self.sell_orders = sell_orders
+        if parameters is None:
+            parameters = default_parameters(self.new_hatchery({}))
+        self.parameters = parameters
+
+    def new_hatchery(self, factors, cash_balance=None):
+        """
+        Creates a hatchery with the technicians of the engine and the
+        parameters multiplied by the given factors.
+
+        Args:
+            factors (dict): a factor for each parameter name to change.
+            cash_balance (float): the starting cash (default the engine's).
+
+        Returns:
+            object: the new 'Hatchery'.
+        """
+        if cash_balance is None:
+            cash_balance = self.cash_balance
+        hatchery = build_hatchery(cash_balance, self.technicians)
+        apply_factors(hatchery, factors)
+        return hatchery
+
+    def profits(self, variants):
+        """
+        Works out the profit of every variant over 'number_of_quarters'.
+
+        Args:
+            variants (list): one dictionary of parameter factors per variant.
+
+        Returns:
+            list: the profit of each variant, in the same order. The
+                  profit of a bankrupt variant is its cash balance when it
+                  went bankrupt; use 'outcomes' to tell them apart.
+        """
+        return [outcome['profit'] for outcome in self.outcomes(variants)]
+
+    def outcomes(self, variants):
+        """
+        Works out the profit of every variant over 'number_of_quarters',
+        and whether it went bankrupt.
+
+        Args:
+            variants (list): one dictionary of parameter factors per variant.
+
+        Returns:
+            list: for each variant, in the same order, a dictionary with
+                  the 'profit', the number of 'quarters' completed and
+                  whether the hatchery went 'bankrupt'.
+        """
+        # Group the variants that have the same stock
+        groups = {}
+        for index, factors in enumerate(variants):
+            key = tuple(sorted(
+                (name, factor) for name, factor in factors.items()
+                if name.split(':')[0] in PHYSICAL_KINDS and factor != 1
+            ))
+            groups.setdefault(key, []).append(index)
+
+        outcomes = [None] * len(variants)
+        for key, indexes in groups.items():
+            # Simulate the stock once, with unlimited cash so that every
+            # purchase is made
+            stock_hatchery = self.new_hatchery(dict(key), float('inf'))
+            reports = Simulation(
+                stock_hatchery, self.vendor_name, self.sell_orders
+            ).run(self.number_of_quarters).reports
+
+            for index in indexes:
+                hatchery = self.new_hatchery(variants[index])
+                outcome = self._replay(hatchery, reports)
+                if outcome is None:
+                    # The cash balance changes the stock, so run it fully
+                    simulation = Simulation(hatchery, self.vendor_name, self.sell_orders)
+                    simulation.run(self.number_of_quarters)
+                    outcome = {
+                        'profit': hatchery.cash_balance - self.cash_balance,
+                        'quarters': simulation.quarter - simulation.bankrupt,
+                        'bankrupt': simulation.bankrupt,
+                    }
+                outcomes[index] = outcome
+        return outcomes
+
+    def _replay(self, hatchery, reports):
+        """
+        Applies the recorded units of each quarter to the prices and rates
+        of a variant, with the same order of steps and checks as main.py.
+
+        Returns:
+            dict: the outcome as in 'outcomes', or None when a purchase
+                  cannot be afforded.
+        """
+        fish_data = hatchery.fish_data.fish_data
+        vendor = hatchery.vendors[self.vendor_name]
+        cash_balance = hatchery.cash_balance
+        quarters = 0
+
+        for report in reports:
+            for fish_name, (units, _) in report.sales.items():
+                cash_balance = round(cash_balance + units * fish_data[fish_name]['price'], 2)
+            cash_balance -= report.rent
+            cash_balance -= sum(
+                units * hatchery.warehouses[warehouse_name].storage_cost_rate[resource]
+                for warehouse_name, resource, units, _ in report.storage
+            )
+            if cash_balance < 0:
+                break
+            cash_balance = round(cash_balance - report.payroll_cost, 2)
+            if cash_balance < 0:
+                break
+            for _, resource, units, _ in report.purchases:
+                cost = vendor.calculate_cost(resource, units)
+                if cash_balance < cost:
+                    return None
+                cash_balance -= cost
+            quarters += 1
+
+        return {
+            'profit': cash_balance - self.cash_balance,
+            'quarters': quarters,
+            'bankrupt': cash_balance < 0,
+        }
+
+    def one_at_a_time(self, step=0.1):
+        """
+        Changes each parameter down and up by 'step' while keeping the
+        others at their values.
+
+        Args:
+            step (float): the relative change of each parameter (default 0.1).
+
+        Returns:
+            dict: for each parameter, the profit at the low and high value,
+                  the effect, which is the change of profit for a change
+                  of 100% of the parameter, and whether the base, low or
+                  high variant went 'bankrupt'. The effect of a bankrupt
+                  variant compares runs of different lengths.
+        """
+        variants = [{}]
+        for name in self.parameters:
+            variants.append({name: 1 - step})
+            variants.append({name: 1 + step})
+        outcomes = self.outcomes(variants)
+        base = outcomes[0]
+
+        effects = {}
+        for position, name in enumerate(self.parameters):
+            low = outcomes[1 + 2 * position]
+            high = outcomes[2 + 2 * position]
+            effects[name] = {
+                'base': base['profit'],
+                'low': low['profit'],
+                'high': high['profit'],
+                'effect': (high['profit'] - low['profit']) / (2 * step),
+                'bankrupt': base['bankrupt'] or low['bankrupt'] or high['bankrupt'],
+            }
+        return effects
+
+    def sobol(self, samples=64, spread=0.2, seed=None):
+        """
+        Estimates first-order and total Sobol indices of every parameter.
+
+        Each parameter factor is drawn uniformly between 1 - spread and
+        1 + spread. The design needs samples * (parameters + 2) variants.
+        They are evaluated by 'profits', which needs one stock simulation
+        for each different set of demand and depreciation factors (see
+        the class description).
+
+        Args:
+            samples (int): the number of base samples (default 64).
+            spread (float): the relative range of the factors (default 0.2).
+            seed (int): the seed of the random numbers, or None.
+
+        Returns:
+            dict: for each parameter, the 'first_order' index (Saltelli),
+                  the 'total' index (Jansen) and the share of the variants
+                  used for the parameter that went 'bankrupt'.
+        """
+        generator = random.Random(seed)
+        count = len(self.parameters)
+
+        def draw():
+            return [generator.uniform(1 - spread, 1 + spread) for _ in range(count)]
+
+        matrix_a = [draw() for _ in range(samples)]
+        matrix_b = [draw() for _ in range(samples)]
+
+        variants = []
+        for row in matrix_a + matrix_b:
+            variants.append(dict(zip(self.parameters, row)))
+        for position in range(count):
+            for row_a, row_b in zip(matrix_a, matrix_b):
+                row = list(row_a)
+                row[position] = row_b[position]
+                variants.append(dict(zip(self.parameters, row)))
+        outcomes = self.outcomes(variants)
+        profits = [outcome['profit'] for outcome in outcomes]
+        bankrupt = [outcome['bankrupt'] for outcome in outcomes]
+        bankrupt_ab = sum(bankrupt[:2 * samples])
+
+        profits_a = profits[:samples]
+        profits_b = profits[samples:2 * samples]
+        all_profits = profits_a + profits_b
+        mean = sum(all_profits) / len(all_profits)
+        variance = sum((profit - mean) ** 2 for profit in all_profits) / len(all_profits)
+
+        indices = {}
+        for position, name in enumerate(self.parameters):
+            start = (2 + position) * samples
+            profits_ab = profits[start:start + samples]
+            bankrupt_share = (
+                (bankrupt_ab + sum(bankrupt[start:start + samples])) / (3 * samples)
+            )
+            if variance == 0:
+                indices[name] = {'first_order': 0.0, 'total': 0.0, 'bankrupt': bankrupt_share}
+                continue
+            first_order = sum(
+                b * (ab - a) for a, b, ab in zip(profits_a, profits_b, profits_ab)
+            ) / samples / variance
+            total = sum(
+                (a - ab) ** 2 for a, ab in zip(profits_a, profits_ab)
+            ) / (2 * samples) / variance
+            indices[name] = {
+                'first_order': first_order, 'total': total, 'bankrupt': bankrupt_share,
+            }
+        return indices
+
+
+def default_parameters(hatchery):
+    """
+    Lists every parameter of a hatchery that can be analysed.
+
+    Args:
+        hatchery (object): the 'Hatchery' to read the parameters from.
+
+    Returns:
+        list: the parameter names.
+    """
+    parameters = []
+    for fish_name in hatchery.fish_data.fish_data:
+        parameters.append(f"price:{fish_name}")
+        parameters.append(f"demand:{fish_name}")
+    for vendor_name, vendor in hatchery.vendors.items():
+        for resource in vendor.prices:
+            parameters.append(f"vendor:{vendor_name}:{resource}")
+    for resource in ['fertilizer', 'feed', 'salt']:
+        parameters.append(f"depreciation:{resource}")
+        parameters.append(f"storage_rate:{resource}")
+    return parameters
+
+
+def apply_factors(hatchery, factors):
+    """
+    Multiplies parameters of a hatchery by factors. Demand is rounded to
+    whole units and depreciation rates are kept at 1 or below.
+
+    Args:
+        hatchery (object): the 'Hatchery' to change.
+        factors (dict): a factor for each parameter name.
+    """
+    fish = hatchery.fish_data
+    for name, factor in factors.items():
+        kind, _, target = name.partition(':')
+        if kind == 'price':
+            fish.fish_data[target]['price'] *= factor
+        elif kind == 'demand':
+            fish.default_demand[target] = max(0, round(fish.default_demand[target] * factor))
+            fish.fish_data[target]['demand'] = fish.default_demand[target]
+        elif kind == 'vendor':
+            vendor_name, _, resource = target.partition(':')
+            hatchery.vendors[vendor_name].prices[resource] *= factor
+        elif kind == 'depreciation':
+            for warehouse in hatchery.warehouses.values():
+                warehouse.depreciation_rate[target] = min(
+                    1, warehouse.depreciation_rate[target] * factor
+                )
+        elif kind == 'storage_rate':
+            for warehouse in hatchery.warehouses.values():
+                warehouse.storage_cost_rate[target] *= factor
+        else:
+            raise ValueError(f"Unknown parameter '{name}'.")
+
+
+if __name__ == "__main__":
+    engine = SensitivityEngine()
+    effects = engine.one_at_a_time()
+
+    print("=== One-at-a-time Sensitivity of Profit ===")
+    print(f"Base profit: £{effects[engine.parameters[0]]['base']:.2f}")
+    for name, effect in sorted(effects.items(), key=lambda item: -abs(item[1]['effect'])):
+        print(
+            f"{name}: £{effect['effect']:.2f} per 100% change "
+            f"(low £{effect['low']:.2f}, high £{effect['high']:.2f})"
+            + (" (bankrupt)" if effect['bankrupt'] else "")
+        )
@@ -0,0 +1,210 @@
+"""
+Filename: session.py
+Date: 19 October 2026
+Description:
+    This module records the answers of an interactive session of main.py
+    to a file, and replays a recorded session without prompts, with all
+    output kept in memory until the session ends.
+"""
+
+import builtins
+import contextlib
+import io
+import sys
+import time
+
+import main
+
+"""
+The 'builtins' module holds the 'input' function that main.py and the
+Hatchery class use for every prompt. Replacing it for the length of a
+session sends every answer through the same checks as a typed answer.
+"""
+
+
+class SessionRecorder:
+    """
+    This class is used in place of 'input' and writes every answer that
+    is typed to a session file, one answer per line.
+
+    A session file is the same as a script that is piped into main.py,
+    so existing scripts can be replayed too.
+
+    Attributes:
+    - file (object): the open session file.
+    - count (int): the number of answers recorded.
+    """
+
+    def __init__(self, file, read=None):
+        """
+        Beginning a recorder.
+
+        Args:
+            file (object): the session file, open for writing.
+            read (function): the function that reads a typed answer
+                             (default the original 'input').
+        """
+        self.file = file
+        self.read = read if read is not None else builtins.input
+        self.count = 0
+
+    def __call__(self, prompt=''):
+        answer = self.read(prompt)
+        self.file.write(answer + '\n')
+        self.count += 1
+        return answer
+
+
+class SessionPlayer:
+    """
+    This class is used in place of 'input' and gives the answers of a
+    recorded session in order. Prompts are not shown.
+
+    Like 'input' at the end of a piped script, it raises EOFError when
+    there are no answers left.
+
+    Attributes:
+    - answers (list): the answers of the session.
+    - position (int): the number of answers given so far.
+    """
+
+    def __init__(self, answers):
+        """
+        Beginning a player.
+
+        Args:
+            answers (list): the answers of the session, without newlines.
+        """
+        self.answers = answers
+        self.position = 0
+
+    def __call__(self, prompt=''):
+        if self.position >= len(self.answers):
+            raise EOFError("The session has no more answers.")
+        answer = self.answers[self.position]
+        self.position += 1
+        return answer
+
+    @property
+    def remaining(self):
+        """
+        The number of answers that were not used.
+        """
+        return len(self.answers) - self.position
+
+
+@contextlib.contextmanager
+def use_input(function):
+    """
+    Replaces 'input' with another function inside a 'with' block.
+    """
+    original = builtins.input
+    builtins.input = function
+    try:
+        yield function
+    finally:
+        builtins.input = original
+
+
+def read_session(path):
+    """
+    Reads the answers of a session file.
+
+    Args:
+        path (str): the session file.
+
+    Returns:
+        list: the answers, one for each line of the file.
+    """
+    with open(path) as file:
+        return file.read().splitlines()
+
+
+def record(path, journal_path=None):
+    """
+    Runs an interactive session and records every answer to a file.
+
+    Args:
+        path (str): the session file to write.
+        journal_path (str): the transaction journal of the session, or
+                            None (default) to run without a journal.
+
+    Returns:
+        int: the number of answers recorded.
+    """
+    with open(path, 'w') as file:
+        recorder = SessionRecorder(file)
+        with use_input(recorder):
+            try:
+                main.main(journal_path)
+            except (EOFError, KeyboardInterrupt):
+                # The session was stopped; keep what was recorded
+                print()
+    return recorder.count
+
+
+def replay(path, journal_path=None):
+    """
+    Replays a recorded session. Every answer goes through the same checks
+    as in an interactive session, but prompts are not shown and output is
+    kept in a buffer instead of being written line by line.
+
+    Args:
+        path (str): the session file to replay.
+        journal_path (str): the transaction journal of the replay, or
+                            None (default) so that replays are not
+                            added to the audit journal.
+
+    Returns:
+        dict: the 'output' of the session, the number of 'answers' used,
+              the number of answers 'remaining', and whether the session
+              was 'complete' (False when it ran out of answers).
+    """
+    player = SessionPlayer(read_session(path))
+    buffer = io.StringIO()
+    complete = True
+    with use_input(player), contextlib.redirect_stdout(buffer):
+        try:
+            main.main(journal_path)
+        except EOFError:
+            complete = False
+    return {
+        'output': buffer.getvalue(),
+        'answers': player.position,
+        'remaining': player.remaining,
+        'complete': complete,
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python Session.py record <session file> [--journal <file>]
+    #        python Session.py replay <session file> [--quiet] [--journal <file>]
+    # Sessions are not added to a transaction journal unless one is given.
+    if len(sys.argv) < 3 or sys.argv[1] not in ('record', 'replay'):
+        print("Usage: python Session.py record|replay <session file> "
+              "[--quiet] [--journal <file>]")
+        sys.exit(1)
+
+    options = sys.argv[3:]
+    journal_path = None
+    if '--journal' in options:
+        position = options.index('--journal') + 1
+        if position >= len(options):
+            print("Please give the journal file after --journal.")
+            sys.exit(1)
+        journal_path = options[position]
+
+    if sys.argv[1] == 'record':
+        count = record(sys.argv[2], journal_path)
+        print(f"Recorded {count} answers to {sys.argv[2]}")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    result = replay(sys.argv[2], journal_path)
+    elapsed = time.perf_counter() - start
+    if '--quiet' not in options:
+        sys.stdout.write(result['output'])
+    print(f"Replayed {result['answers']} answers in {elapsed:.2f} s", file=sys.stderr)
+    if not result['complete']:
+        print("The session ran out of answers before the end.", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,398 @@
+"""
+Filename: sharedstate.py
+Date: 19 October 2026
+Description:
+    This module defines the SharedCatalogue and SharedBatchState classes,
+    which keep the fish, vendor and warehouse tables and the state of many
+    hatcheries in shared memory, so that worker processes can use them
+    without copying.
+"""
+
+import copy
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+from Report import ReportBook
+from Simulation import Simulation, build_hatchery
+
+"""
+The 'shared_memory' module gives blocks of memory that every process can
+attach to by name. The blocks are read and written as arrays of floats.
+"""
+
+RESOURCES = ('fertilizer', 'feed', 'salt')
+WAREHOUSES = ('main', 'auxiliary')
+FISH_FIELDS = ('fertilizer', 'feed', 'salt', 'maintenance_time', 'demand', 'price')
+# Fish fields that are always whole numbers. Prices and amounts can be
+# fractional in a template, so they are kept as floats.
+WHOLE_FISH_FIELDS = ('demand',)
+
+# The columns of each hatchery in the batch state
+STATE_COLUMNS = (
+    ('cash_balance',)
+    + tuple(f"{warehouse}:{resource}" for warehouse in WAREHOUSES for resource in RESOURCES)
+    + ('quarters', 'bankrupt', 'revenue', 'storage_cost', 'purchase_cost',
+       'depreciation_loss')
+)
+FLOAT_SIZE = 8
+
+
+class _SharedArray:
+    """
+    This class holds a shared memory block that is used as an array of floats.
+
+    Attributes:
+    - memory (object): the 'SharedMemory' block.
+    - values (memoryview): the floats in the block, without a copy.
+    """
+
+    def __init__(self, name=None, count=0):
+        """
+        Creates a new block of 'count' floats, or attaches to the block
+        called 'name' when it is given.
+        """
+        if name is None:
+            self.memory = shared_memory.SharedMemory(
+                create=True, size=max(1, count) * FLOAT_SIZE
+            )
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.values = self.memory.buf.cast('d')
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def close(self):
+        """
+        Stops using the block in this process.
+        """
+        if self.values is not None:
+            self.values.release()
+            self.values = None
+            self.memory.close()
+
+    def unlink(self):
+        """
+        Closes and frees the block. Only the process that created it
+        should call this.
+        """
+        self.close()
+        self.memory.unlink()
+
+
+class SharedCatalogue(_SharedArray):
+    """
+    This class keeps the read-only tables of a hatchery in shared memory.
+
+    The block holds, in order, the fields of every fish type, the prices
+    of every vendor, and the capacity, depreciation rate and storage cost
+    rate of every resource in the main and auxiliary warehouses.
+
+    Attributes:
+    - fish_names (tuple): the fish types, in the order of the table.
+    - vendor_names (tuple): the vendors, in the order of the table.
+    """
+
+    def __init__(self, fish_names, vendor_names, name=None):
+        """
+        Creates or attaches to a catalogue block.
+
+        Args:
+            fish_names (tuple): the fish types.
+            vendor_names (tuple): the vendors.
+            name (str): the block to attach to, or None to create one.
+        """
+        self.fish_names = tuple(fish_names)
+        self.vendor_names = tuple(vendor_names)
+        count = (
+            len(self.fish_names) * len(FISH_FIELDS)
+            + len(self.vendor_names) * len(RESOURCES)
+            + len(WAREHOUSES) * 3 * len(RESOURCES)
+        )
+        super().__init__(name, count)
+
+    @classmethod
+    def from_hatchery(cls, hatchery):
+        """
+        Creates a catalogue block with the tables of a hatchery.
+
+        Args:
+            hatchery (object): the 'Hatchery' to copy the tables from.
+
+        Returns:
+            object: the new 'SharedCatalogue'.
+        """
+        fish_data = hatchery.fish_data
+        catalogue = cls(fish_data.fish_data, hatchery.vendors)
+        values = []
+        for fish_name in catalogue.fish_names:
+            for field in FISH_FIELDS:
+                if field == 'demand':
+                    values.append(fish_data.default_demand[fish_name])
+                else:
+                    values.append(fish_data.fish_data[fish_name][field])
+        for vendor_name in catalogue.vendor_names:
+            values += [hatchery.vendors[vendor_name].prices[resource] for resource in RESOURCES]
+        for warehouse_name in WAREHOUSES:
+            warehouse = hatchery.warehouses[warehouse_name]
+            for table in (warehouse.capacity, warehouse.depreciation_rate,
+                          warehouse.storage_cost_rate):
+                values += [table[resource] for resource in RESOURCES]
+        for index, value in enumerate(values):
+            catalogue.values[index] = value
+        return catalogue
+
+    def describe(self):
+        """
+        Returns the small description that workers need to attach.
+        """
+        return (self.fish_names, self.vendor_names, self.name)
+
+    @classmethod
+    def attach(cls, description):
+        """
+        Attaches to a catalogue block from its description.
+        """
+        return cls(*description)
+
+    def load_into(self, hatchery):
+        """
+        Writes the tables of the catalogue into a hatchery.
+
+        Args:
+            hatchery (object): the 'Hatchery' to update.
+        """
+        values = self.values
+        position = 0
+        fish_data = hatchery.fish_data
+        for fish_name in self.fish_names:
+            fish_details = fish_data.fish_data[fish_name]
+            for field in FISH_FIELDS:
+                value = values[position]
+                fish_details[field] = int(value) if field in WHOLE_FISH_FIELDS else value
+                position += 1
+            fish_data.default_demand[fish_name] = fish_details['demand']
+        for vendor_name in self.vendor_names:
+            prices = hatchery.vendors[vendor_name].prices
+            for resource in RESOURCES:
+                prices[resource] = values[position]
+                position += 1
+        for warehouse_name in WAREHOUSES:
+            warehouse = hatchery.warehouses[warehouse_name]
+            for resource in RESOURCES:
+                warehouse.capacity[resource] = int(values[position])
+                position += 1
+            for table in (warehouse.depreciation_rate, warehouse.storage_cost_rate):
+                for resource in RESOURCES:
+                    table[resource] = values[position]
+                    position += 1
+
+
+class SharedBatchState(_SharedArray):
+    """
+    This class keeps the state of many hatcheries in shared memory.
+
+    Each hatchery has one row with the columns of 'STATE_COLUMNS': the
+    cash balance, the supplies of each warehouse, the quarters completed,
+    whether it went bankrupt, and the totals of its revenue, storage cost,
+    purchase cost and depreciation loss. Workers write only their own rows.
+
+    Attributes:
+    - rows (int): the number of hatcheries.
+    """
+
+    def __init__(self, rows, name=None):
+        """
+        Creates or attaches to a batch state block.
+
+        Args:
+            rows (int): the number of hatcheries.
+            name (str): the block to attach to, or None to create one.
+        """
+        self.rows = rows
+        super().__init__(name, rows * len(STATE_COLUMNS))
+
+    def describe(self):
+        """
+        Returns the small description that workers need to attach.
+        """
+        return (self.rows, self.name)
+
+    @classmethod
+    def attach(cls, description):
+        """
+        Attaches to a batch state block from its description.
+        """
+        return cls(*description)
+
+    def get(self, row, column):
+        """
+        Reads one value of a hatchery.
+        """
+        return self.values[row * len(STATE_COLUMNS) + STATE_COLUMNS.index(column)]
+
+    def set(self, row, column, value):
+        """
+        Writes one value of a hatchery.
+        """
+        self.values[row * len(STATE_COLUMNS) + STATE_COLUMNS.index(column)] = value
+
+    def load_row(self, row, hatchery):
+        """
+        Writes the cash balance and supplies of a row into a hatchery.
+        """
+        hatchery.cash_balance = self.get(row, 'cash_balance')
+        for warehouse_name in WAREHOUSES:
+            supplies = hatchery.warehouses[warehouse_name].supplies
+            for resource in RESOURCES:
+                supplies[resource] = self.get(row, f"{warehouse_name}:{resource}")
+
+    def store_row(self, row, hatchery, quarters=0, bankrupt=False, simulation=None):
+        """
+        Writes the state of a hatchery into its row, with the totals of
+        its simulation when one is given.
+        """
+        self.set(row, 'cash_balance', hatchery.cash_balance)
+        for warehouse_name in WAREHOUSES:
+            supplies = hatchery.warehouses[warehouse_name].supplies
+            for resource in RESOURCES:
+                self.set(row, f"{warehouse_name}:{resource}", supplies[resource])
+        self.set(row, 'quarters', quarters)
+        self.set(row, 'bankrupt', 1 if bankrupt else 0)
+        if simulation is not None:
+            rollup = simulation.report_book.rollup
+            self.set(row, 'revenue', rollup.revenue)
+            self.set(row, 'storage_cost', rollup.storage_cost)
+            self.set(row, 'purchase_cost', rollup.purchase_cost)
+            self.set(row, 'depreciation_loss', simulation.depreciation_loss)
+
+    def to_rows(self):
+        """
+        Copies the state of every hatchery into a list of dictionaries.
+        """
+        return [
+            {column: self.get(row, column) for column in STATE_COLUMNS}
+            for row in range(self.rows)
+        ]
+
+
+# The blocks and settings of a worker process
+_worker = {}
+
+
+def _start_worker(catalogue_description, state_description, technicians,
+                  vendor_name, sell_orders, policy):
+    """
+    Attaches a worker process to the shared blocks and builds the one
+    hatchery that the worker reuses for all its rows.
+    """
+    _worker['catalogue'] = SharedCatalogue.attach(catalogue_description)
+    _worker['state'] = SharedBatchState.attach(state_description)
+    hatchery = build_hatchery(0, technicians)
+    _worker['catalogue'].load_into(hatchery)
+    _worker['hatchery'] = hatchery
+    _worker['vendor_name'] = vendor_name
+    _worker['sell_orders'] = sell_orders
+    _worker['policy'] = policy
+
+
+def _run_rows(task):
+    """
+    Simulates the hatcheries of a slice of rows and writes the results
+    back into the same rows. The tables of the worker's hatchery do not
+    change, so only its cash balance, supplies and sales are reset.
+    """
+    start, stop, number_of_quarters = task
+    state = _worker['state']
+    hatchery = _worker['hatchery']
+    for row in range(start, stop):
+        state.load_row(row, hatchery)
+        hatchery.sales = {}
+        # Each hatchery gets a fresh copy of the policy and its history
+        simulation = Simulation(
+            hatchery, _worker['vendor_name'], _worker['sell_orders'],
+            ReportBook(keep_quarters=False), copy.deepcopy(_worker['policy']),
+        )
+        simulation.run(number_of_quarters)
+        # The quarter in which the hatchery went bankrupt was not completed
+        state.store_row(
+            row, hatchery, simulation.quarter - simulation.bankrupt,
+            simulation.bankrupt, simulation,
+        )
+    return stop - start
+
+
+def run_parallel(cash_balances, number_of_quarters, technicians,
+                 vendor_name='Slippery Lakes', sell_orders=None, template=None,
+                 policy=None, processes=None):
+    """
+    Simulates one hatchery for each starting cash balance in worker
+    processes that share the tables and the state arrays.
+
+    Only the names of the blocks and the row numbers are sent to the
+    workers, so nothing large is copied between processes.
+
+    Args:
+        cash_balances (list): the starting cash balance of each hatchery.
+        number_of_quarters (int): the number of quarters to simulate.
+        technicians (list): (name, speciality) pairs for every hatchery.
+        vendor_name (str): the vendor to buy from (default 'Slippery Lakes').
+        sell_orders (list): orders for every quarter, see 'Simulation'.
+        template (object): the 'Hatchery' whose tables are shared, or None
+                           for the standard tables.
+        policy (object): the inventory policy, or None to refill to capacity.
+        processes (int): the number of worker processes (default all CPUs).
+
+    Returns:
+        list: the final state of each hatchery, with the 'STATE_COLUMNS' keys.
+    """
+    if template is None:
+        template = build_hatchery(0, technicians)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    catalogue = SharedCatalogue.from_hatchery(template)
+    state = SharedBatchState(len(cash_balances))
+    try:
+        # Every hatchery starts with full warehouses
+        for row, cash_balance in enumerate(cash_balances):
+            state.set(row, 'cash_balance', cash_balance)
+            for warehouse_name in WAREHOUSES:
+                capacity = template.warehouses[warehouse_name].capacity
+                for resource in RESOURCES:
+                    state.set(row, f"{warehouse_name}:{resource}", capacity[resource])
+
+        chunk = max(1, -(-len(cash_balances) // (processes * 4)))
+        tasks = [
+            (start, min(start + chunk, len(cash_balances)), number_of_quarters)
+            for start in range(0, len(cash_balances), chunk)
+        ]
+        with multiprocessing.Pool(
+            processes, initializer=_start_worker,
+            initargs=(catalogue.describe(), state.describe(), technicians,
+                      vendor_name, sell_orders, policy),
+        ) as pool:
+            for _ in pool.imap_unordered(_run_rows, tasks):
+                pass
+        return state.to_rows()
+    finally:
+        catalogue.unlink()
+        state.unlink()
+
+
+if __name__ == "__main__":
+    technicians = [('Anna', None), ('Ben', 'Modal Bass')]
+    cash_balances = [1000 + 5 * index for index in range(2000)]
+
+    start = time.perf_counter()
+    results = run_parallel(cash_balances, 20, technicians)
+    elapsed = time.perf_counter() - start
+
+    bankrupt = sum(1 for result in results if result['bankrupt'])
+    print(f"Simulated {len(results)} hatcheries for 20 quarters in {elapsed:.2f} s")
+    print(f"Bankrupt: {bankrupt}, Average cash balance: £"
+          f"{sum(result['cash_balance'] for result in results) / len(results):.2f}, "
+          f"Average quarters completed: "
+          f"{sum(result['quarters'] for result in results) / len(results):.1f}")
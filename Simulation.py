@@ -0,0 +1,260 @@
+"""
+Filename: simulation.py
+Date: 19 October 2026
+Description:
+    This module defines the Simulation class, which runs the quarters of
+    a hatchery without prompts or printing. It follows the same steps as
+    main.py and keeps the raw numbers of every quarter in a ReportBook.
+"""
+
+import contextlib
+import io
+import math
+
+from Fish import Fish
+from Hatchery import Hatchery
+from Policy import RefillToCapacity
+from Report import ReportBook
+from Scheduler import AssignmentScheduler
+
+
+class Simulation:
+    """
+    This class runs a hatchery without any user interaction.
+
+    Purpose:
+    - To simulate many quarters quickly, for example for planning or
+      analysis, without building text that nobody reads.
+    - To use the same sale checks and costs as the interactive program.
+
+    Technicians are not hired or removed during the run, so they should
+    be added to the hatchery before the simulation starts.
+
+    Attributes:
+    - hatchery (object): the 'Hatchery' to simulate.
+    - vendor_name (str): the vendor that supplies are bought from.
+    - sell_orders (list): (fish name, quantity) orders placed every quarter.
+      A quantity of None sells as many units as possible.
+    - report_book (object): the 'ReportBook' that keeps the quarter reports.
+    - policy (object): the inventory policy that decides the purchases.
+    - bankrupt (bool): whether the hatchery went bankrupt.
+    - depreciation_loss (float): the value of the supplies lost to
+      depreciation, at the prices of the vendor.
+    """
+
+    def __init__(self, hatchery, vendor_name='Slippery Lakes', sell_orders=None,
+                 report_book=None, policy=None):
+        """
+        Beginning a simulation of a hatchery.
+
+        Args:
+            hatchery (object): the 'Hatchery' to simulate.
+            vendor_name (str): the vendor to buy from (default 'Slippery Lakes').
+            sell_orders (list): orders to place every quarter. By default
+                                every fish type is sold as much as possible.
+            report_book (object): the 'ReportBook' to fill, or None for a new one.
+            policy (object): the inventory policy, or None (default) to
+                             refill to capacity like main.py.
+        """
+        self.hatchery = hatchery
+        self.vendor_name = vendor_name
+        if sell_orders is None:
+            sell_orders = [(fish_name, None) for fish_name in hatchery.fish_data.fish_data]
+        self.sell_orders = sell_orders
+        self.report_book = report_book if report_book is not None else ReportBook()
+        self.policy = policy if policy is not None else RefillToCapacity()
+        self.quarter = 0
+        self.bankrupt = False
+        self.depreciation_loss = 0
+
+    def run(self, number_of_quarters):
+        """
+        Runs quarters until the last one or until the hatchery goes bankrupt.
+
+        Args:
+            number_of_quarters (int): the number of quarters to simulate.
+
+        Returns:
+            object: the 'ReportBook' with the reports of the quarters.
+        """
+        for _ in range(number_of_quarters):
+            if not self.run_quarter():
+                break
+        return self.report_book
+
+    def run_quarter(self):
+        """
+        Runs one quarter with the same steps as main.py.
+
+        Returns:
+            bool: False when the hatchery went bankrupt, True otherwise.
+        """
+        hatchery = self.hatchery
+        self.quarter += 1
+        if hatchery.journal is not None:
+            hatchery.journal.begin_quarter(self.quarter, hatchery.cash_balance)
+        hatchery.report = self.report_book.start_quarter(
+            self.quarter, hatchery.cash_balance
+        )
+
+        # Reset sales and fish demand for the new quarter
+        hatchery.sales = {}
+        hatchery.fish_data.reset_fish_demand()
+
+        try:
+            self.sell()
+
+            hatchery.pay_storage_cost()
+            if hatchery.cash_balance < 0:
+                self.bankrupt = True
+                return False
+
+            vendor = hatchery.vendors[self.vendor_name]
+            for resource, units in hatchery.apply_depreciation().items():
+                self.depreciation_loss += vendor.calculate_cost(resource, units)
+
+            hatchery.pay_technicians()
+            if hatchery.cash_balance < 0:
+                self.bankrupt = True
+                return False
+
+            self.restock()
+            if hatchery.journal is not None:
+                hatchery.journal.end_quarter(hatchery.cash_balance)
+            if hatchery.cash_balance < 0:
+                self.bankrupt = True
+                return False
+            return True
+        finally:
+            self.report_book.close_quarter(hatchery.report, hatchery.cash_balance)
+            hatchery.report = None
+
+    def sell(self):
+        """
+        Places the sell orders of the quarter with the same checks as
+        'Hatchery.sell_fish'. Orders that fail a check are skipped.
+        """
+        for fish_name, quantity, requirements in self.plan_sales():
+            self.hatchery.complete_sale(fish_name, quantity, requirements)
+
+    def plan_sales(self):
+        """
+        Checks the sell orders of the quarter without selling anything.
+
+        Returns:
+            list: (fish name, quantity, requirements) for every order
+                  that passes the checks, in the order they are placed.
+        """
+        hatchery = self.hatchery
+        fish_data = hatchery.fish_data.fish_data
+        scheduler = AssignmentScheduler(hatchery.technicians, hatchery.fish_data)
+        available_resources = hatchery.total_supplies()
+        # The demand left for each fish after the orders placed so far
+        demand = {
+            fish_name: fish_details['demand'] for fish_name, fish_details in fish_data.items()
+        }
+        sales = []
+
+        for fish_name, quantity in self.sell_orders:
+            if fish_name not in fish_data:
+                continue
+            if quantity is None:
+                quantity = self.max_quantity(
+                    fish_name, scheduler, available_resources, demand[fish_name]
+                )
+            if quantity <= 0 or quantity > demand[fish_name]:
+                continue
+
+            assignment = scheduler.plan(fish_name, quantity)
+            if not assignment['feasible']:
+                continue
+            requirements = hatchery.resource_requirements(fish_name, quantity)
+            if any(requirements[resource] > available_resources[resource]
+                   for resource in requirements):
+                continue
+
+            scheduler.commit(assignment)
+            demand[fish_name] -= quantity
+            for resource in available_resources:
+                available_resources[resource] -= requirements[resource]
+            sales.append((fish_name, quantity, requirements))
+        return sales
+
+    def max_quantity(self, fish_name, scheduler, available_resources, demand=None):
+        """
+        Works out the largest quantity of a fish that passes the checks of
+        demand, technician time and resources. The demand left can be
+        given, otherwise the demand of the fish type is used.
+
+        Returns:
+            int: the largest quantity that can be sold (can be 0).
+        """
+        hatchery = self.hatchery
+        if demand is None:
+            demand = hatchery.fish_data.fish_data[fish_name]['demand']
+        quantity = demand
+        time_per_unit, _ = hatchery.maintenance_time_per_unit(fish_name)
+        if time_per_unit > 0:
+            quantity = min(
+                quantity, math.floor(scheduler.remaining_days / time_per_unit)
+            )
+        per_unit = hatchery.resource_requirements(fish_name, 1)
+        for resource, need in per_unit.items():
+            if need > 0:
+                quantity = min(
+                    quantity, math.floor(available_resources[resource] / need)
+                )
+
+        def fits(units):
+            requirements = hatchery.resource_requirements(fish_name, units)
+            return (
+                all(requirements[resource] <= available_resources[resource]
+                    for resource in requirements)
+                and scheduler.plan(fish_name, units)['feasible']
+            )
+
+        # Search for the largest quantity that the technicians can look after
+        low, high = 0, max(0, quantity)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if fits(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def restock(self):
+        """
+        Buys the amount of every resource that the inventory policy asks
+        for. The standard policy fills the warehouses like main.py.
+        """
+        hatchery = self.hatchery
+        for resource in ['fertilizer', 'feed', 'salt']:
+            amount_needed = self.policy.order_amount(hatchery, resource, self.quarter)
+            if amount_needed > 0:
+                purchase = hatchery.buy_resource(self.vendor_name, resource, amount_needed)
+                if purchase is not None:
+                    self.policy.record_purchase(hatchery, resource, purchase[0])
+
+
+def build_hatchery(cash_balance, technicians, capacities=None):
+    """
+    Creates a hatchery with its own fish data and hires technicians
+    without printing.
+
+    Args:
+        cash_balance (float): the starting cash balance.
+        technicians (list): (name, speciality) pairs, where speciality
+                            can be None.
+        capacities (dict): the warehouse capacities, or None (default)
+                           for the standard capacities.
+
+    Returns:
+        object: the new 'Hatchery'.
+    """
+    hatchery = Hatchery(cash_balance, Fish(), capacities=capacities)
+    # Hiring prints a message, which is not needed here
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, speciality in technicians:
+            hatchery.add_technician(name, speciality=speciality or '')
+    return hatchery
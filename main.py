@@ -13,8 +13,16 @@ from Technician import Technicians
 from Warehouse import Warehouse
 from Vendors import Vendor
 from Hatchery import Hatchery
+from Journal import Journal
+from Policy import RefillToCapacity
 
-def main():
+# The file that keeps the transaction journal of every simulation run
+JOURNAL_PATH = 'hatchery_journal.fhj'
+
+# The inventory policy that decides how much of each resource to buy
+REORDER_POLICY = RefillToCapacity()
+
+def main(journal_path=JOURNAL_PATH):
 
     """
     This is the main function that is the entry point for 
@@ -27,13 +35,37 @@ def main():
     and buy supplies from vendors. The simulation will end when the number 
     of quarters equal to the number that they filled or they face with bankruptcy.
 
+    Args:
+        journal_path (str): the file to append the transaction journal to,
+                            or None to run without a journal.
     """
     # Beginning fish data from the 'Fish' class
     fish_data = Fish()
 
-    # Create a hatchery with a 10000 cash balance
-    hatchery = Hatchery(cash_balance=10000, fish_data=fish_data)
+    # Create a hatchery with a 10000 cash balance and record its transactions
+    journal = Journal(journal_path) if journal_path is not None else None
+    hatchery = Hatchery(cash_balance=10000, fish_data=fish_data, journal=journal)
+    if journal is None:
+        run_quarters(hatchery, fish_data)
+        return
+    journal.open_session(hatchery.cash_balance)
+
+    try:
+        run_quarters(hatchery, fish_data)
+    finally:
+        # Make sure every transaction is written to the journal
+        journal.close()
+
+
+def run_quarters(hatchery, fish_data):
+    """
+    Asks for the number of quarters and simulates them one by one
+    until the last quarter or until the hatchery goes bankrupt.
 
+    Args:
+        hatchery (object): the 'Hatchery' to simulate.
+        fish_data (object): the 'Fish' data used by the hatchery.
+    """
     # Prompt the user to enter the number of quarters to run the simulation.
     while True:
         try:
@@ -55,6 +87,8 @@ def main():
     # Simulate each quarter
     for quarter in range(1, number_of_quarters + 1):
         print(f"\n====== SIMULATING quarter {quarter} ======")
+        if hatchery.journal is not None:
+            hatchery.journal.begin_quarter(quarter, hatchery.cash_balance)
 
         # Reset sales for the new quarter
         hatchery.sales = {}
@@ -158,42 +192,28 @@ def main():
         vendor_name = (
             'Slippery Lakes' if vendor_choice == '1' else 'Scaly Wholesaler'
         )
-        vendor = hatchery.vendors[vendor_name]
 
         # Refill supplies 
         for resource in ['fertilizer', 'feed', 'salt']:
-            # Calculate total capacity and the quantity 
-            total_capacity = sum(
-                warehouse.capacity[resource] for warehouse in hatchery.warehouses.values()
-            )
-            current_quantity = sum(
-                warehouse.supplies[resource] for warehouse in hatchery.warehouses.values()
-            )
-            amount_needed = max(0, total_capacity - current_quantity)
+            # Ask the inventory policy for the quantity to buy
+            amount_needed = REORDER_POLICY.order_amount(hatchery, resource, quarter)
 
             if amount_needed > 0:  # Buy only if the resource is needed
-                # Calculate cost of purchase
-                cost = vendor.calculate_cost(resource, amount_needed)  
-                # Check if the cash balance is sufficient
-                if hatchery.cash_balance >= cost:  
-                    hatchery.cash_balance -= cost  # Deduct the cost
-                    remaining_amount_needed = amount_needed
-
-                    # Refill resources in warehouses
-                    for warehouse in hatchery.warehouses.values():
-                        remaining_amount_needed = warehouse.refill_resources(
-                            resource, remaining_amount_needed
-                        )
-                        if remaining_amount_needed == 0:  
-                            break
-
+                # Buy and refill resources in warehouses if cash is sufficient
+                purchase = hatchery.buy_resource(vendor_name, resource, amount_needed)
+                if purchase is not None:
+                    purchased, cost = purchase
+                    REORDER_POLICY.record_purchase(hatchery, resource, purchased)
                     # Shows the quantity purchased and cost
                     print(
-                        f"Purchased {amount_needed - remaining_amount_needed} units of "
+                        f"Purchased {purchased} units of "
                         f"{resource} from {vendor_name} for £{cost:.2f}"
                     )
                 else:
                     # Show if user face with insufficient cash 
+                    cost = hatchery.vendors[vendor_name].calculate_cost(
+                        resource, amount_needed
+                    )
                     print(
                         f"Not enough cash to purchase {resource}. "
                         f"Needed: £{cost:.2f}, Available: £{hatchery.cash_balance:.2f}"
@@ -203,6 +223,8 @@ def main():
         print(f"\n--- End of Quarter {quarter} ---")
         print(f"Cash balance after Quarter {quarter}: £{hatchery.cash_balance:.2f}")
         print(f"----------------------------------\n")
+        if hatchery.journal is not None:
+            hatchery.journal.end_quarter(hatchery.cash_balance)
         
         # Check for bankruptcy
         if hatchery.cash_balance < 0:
@@ -0,0 +1,112 @@
+"""
+Tests for the transaction journal in Journal.py.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Journal import Journal, read_journal, replay
+from Simulation import Simulation, build_hatchery
+
+TECHNICIANS = [('Anna', None), ('Ben', 'Modal Bass')]
+
+
+def run_session(path, number_of_quarters):
+    """
+    Runs a headless simulation that appends one session to a journal.
+    """
+    with Journal(path) as journal:
+        hatchery = build_hatchery(10000, TECHNICIANS)
+        hatchery.journal = journal
+        journal.open_session(hatchery.cash_balance)
+        Simulation(hatchery).run(number_of_quarters)
+
+
+class JournalRecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'journal.fhj')
+
+    def test_partial_record_is_cut_before_appending(self):
+        run_session(self.path, 3)
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 10)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            run_session(self.path, 3)
+        self.assertEqual(len(caught), 1)
+        self.assertIn('incomplete record', str(caught[0].message))
+
+        body = os.path.getsize(self.path) - len(Journal.MAGIC)
+        self.assertEqual(body % Journal.RECORD.size, 0)
+
+        records = read_journal(self.path)
+        self.assertTrue(all(entry['kind'] in Journal.TYPE_NAMES for entry in records))
+        self.assertTrue(all(entry['quarter'] <= 3 for entry in records))
+        self.assertEqual(sum(entry['kind'] == Journal.OPEN for entry in records), 2)
+
+        for quarter in (1, 2, 3):
+            state = replay(self.path, quarter)
+            self.assertEqual(state['cash_balance'], state['checkpoint_balance'])
+
+    def test_partial_header_is_started_again(self):
+        with open(self.path, 'wb') as file:
+            file.write(Journal.MAGIC[:2])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            run_session(self.path, 1)
+        state = replay(self.path, 1)
+        self.assertEqual(state['cash_balance'], state['checkpoint_balance'])
+
+    def test_other_file_is_not_appended_to(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a journal')
+        with self.assertRaises(ValueError):
+            Journal(self.path)
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), b'not a journal')
+
+
+class JournalReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'journal.fhj')
+
+    def test_replay_rebuilds_supplies(self):
+        supplies = {}
+        with Journal(self.path) as journal:
+            hatchery = build_hatchery(10000, TECHNICIANS)
+            hatchery.journal = journal
+            journal.open_session(hatchery.cash_balance)
+            simulation = Simulation(hatchery)
+            for quarter in range(1, 9):
+                simulation.run_quarter()
+                supplies[quarter] = {
+                    name: dict(warehouse.supplies)
+                    for name, warehouse in hatchery.warehouses.items()
+                }
+
+        for quarter, expected in supplies.items():
+            self.assertEqual(replay(self.path, quarter)['supplies'], expected)
+
+    def test_long_label_is_cut_at_a_character_boundary(self):
+        label = 'é' * 20
+        with Journal(self.path) as journal:
+            journal.open_session(0)
+            with self.assertWarns(UserWarning):
+                journal.record(Journal.PAYROLL, -1, 12, label)
+        self.assertEqual(read_journal(self.path)[-1]['label'], 'é' * 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+"""
+Tests that every simulation engine still gives the golden traces that
+are kept in tests/golden_traces.json.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Regression import ENGINES, GOLDEN_PATH, check
+
+
+class GoldenTraceTest(unittest.TestCase):
+
+    def test_engines_match_golden_traces(self):
+        results = check(GOLDEN_PATH, ENGINES)
+        for name, result in results.items():
+            with self.subTest(engine=name):
+                self.assertEqual(result['differences'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()